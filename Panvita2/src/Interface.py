@@ -5,44 +5,54 @@
 # ==============================================================================
 
 import sys
+import atexit
 import os
+import re
 import json
 import shutil
 import csv
-import multiprocessing
+import gzip
+import operator
+import codecs
+import concurrent.futures
 import webbrowser
 import sqlite3
+import tempfile
+import time
+import importlib.util
+from functools import lru_cache
+from collections import Counter, deque
 from datetime import datetime
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QGridLayout, QPushButton, QLabel, 
                              QCheckBox, QRadioButton, QSlider, QSpinBox, 
-                             QFileDialog, QTextEdit, QStackedWidget, QFrame, 
-                             QButtonGroup, QListWidget, QGraphicsDropShadowEffect,
-                             QMessageBox, QColorDialog, QGroupBox, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QAbstractItemView,
-                             QProgressBar, QListWidgetItem, QComboBox,
+                             QFileDialog, QTextEdit, QPlainTextEdit, QStackedWidget, QFrame, 
+                             QButtonGroup, QListView,
+                             QMessageBox, QGroupBox,
+                             QHeaderView, QAbstractItemView,
+                             QProgressBar, QComboBox,
                              QSystemTrayIcon, QDialog, QLineEdit, QFormLayout, 
                              QDialogButtonBox, QTabWidget, QScrollArea, QTextBrowser,
-                             QMenu, QSplitter)
+                             QMenu, QSplitter, QTableView, QSizePolicy)
 from PyQt6.QtGui import (QPixmap, QFont, QTextCursor, QColor, QImageReader, 
-                         QIcon, QPainter, QPdfWriter, QAction, QKeySequence, QShortcut)
+                         QIcon, QPainter, QAction, QTextCharFormat, QTextDocument, QKeySequence, QShortcut)
 from PyQt6.QtCore import (Qt, QProcess, QProcessEnvironment, QPoint, QSize, 
-                          QSettings, QThread, pyqtSignal, QTimer, QUrl)
+                          QSettings, QThread, pyqtSignal, QTimer, QUrl,
+                          QAbstractTableModel, QAbstractListModel, QStringListModel, QModelIndex)
 
-# Try to import WebEngine for Interactive HTML Graphs
-try:
-    from PyQt6.QtWebEngineWidgets import QWebEngineView
-    WEB_ENGINE_AVAILABLE = True
-except ImportError:
-    WEB_ENGINE_AVAILABLE = False
+# WebEngine (Interactive HTML Graphs) and psutil (Hardware Monitoring) are only
+# looked up here; the modules themselves are imported on first use, and a module
+# that is installed but fails to load clears its flag there
+def module_available(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-# Try to import psutil for Hardware Monitoring
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+WEB_ENGINE_AVAILABLE = module_available("PyQt6.QtWebEngineWidgets")
+PSUTIL_AVAILABLE = module_available("psutil")
+psutil = None
 
 
 # I18N DICTIONARY (TRANSLATIONS)
@@ -96,8 +106,105 @@ LANGUAGES = {
     }
 }
 
+# orjson (optional) is a faster drop-in for presets and the core's JSON progress lines
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj):
+        # Same layout as orjson (2-space indent, raw UTF-8), so presets match either way
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    json_loads = json.loads
+
+def write_atomic(path, data):
+    # Write next to the target and swap it in, so a failed save never truncates the old file
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+# Status badges of the pre-flight check
+STATUS_BADGES = {
+    "found": "<span style='color:#50fa7b;'>✅ Found</span>",
+    "missing": "<span style='color:#ff5555;'>❌ Missing</span>",
+    "custom": "<span style='color:#50fa7b;'>✅ Custom</span>",
+    "custom_fail": "<span style='color:#ff5555;'>❌ Custom Fail</span>",
+    "system_path": "<span style='color:#50fa7b;'>✅ System PATH</span>",
+    "hw_active": "<span style='color:#50fa7b;'>✅ Active</span>",
+    "hw_missing": "<span style='color:#f1fa8c;'>⚠️ pip install psutil</span>",
+}
+
+# Bytes read from an input file to recognise it as FASTA or GenBank
+VALIDATE_READ_SIZE = 4096
+VALIDATE_WORKERS = 32
+
+# Seconds a tool lookup from the pre-flight check stays valid
+PREFLIGHT_CACHE_TTL = 5.0
+
+# Terminal output is appended in batches and old lines are dropped past this count
+TERMINAL_FLUSH_MS = 100
+TERMINAL_MAX_BLOCKS = 5000
+
+# Log line colors, first matching pattern wins (case-insensitive, no lowercased copy)
+LOG_COLORS = (
+    (re.compile("error|exception|failed", re.I), "#ff5555"),
+    (re.compile("success|completed|done", re.I), "#50fa7b"),
+    (re.compile("warning", re.I), "#f1fa8c"),
+    (re.compile("aborted", re.I), "#ff5555"),
+)
+
+# Plain-text progress hints from the pipeline: pattern, status text, minimum progress
+STATUS_STAGES = (
+    (re.compile("aligning|running diamond|running blast", re.I), "Status: Aligning sequences... ", 30),
+    (re.compile("downloading|ncbi", re.I), "Status: Downloading from NCBI... ", 60),
+    (re.compile("plotting|generating graph", re.I), "Status: Generating output graphs... ", 90),
+)
+# Any stage keyword; most lines have none and are settled by this one search
+STATUS_KEYWORDS = re.compile("|".join(pattern.pattern for pattern, _, _ in STATUS_STAGES), re.I)
+
 # MULTITHREADING WORKER FOR CSV LOADING
 
+# Read buffer for result CSVs (the 8 KiB default means one syscall per few rows)
+CSV_READ_BUFFER = 1 << 20
+CSV_WRITE_BUFFER = 1 << 20
+CSV_EXPORT_CHUNK = 10000
+
+def open_export(path, newline=None, buffering=-1):
+    """Text file for an export, gzip-compressed when the name ends in .gz"""
+    if path.lower().endswith('.gz'):
+        # Level 1 is several times faster than the default and still shrinks text well
+        return gzip.open(path, 'wt', compresslevel=1, encoding='utf-8', newline=newline)
+    return open(path, 'w', newline=newline, encoding='utf-8', buffering=buffering)
+
+def parse_csv(path):
+    """Parse a CSV with the csv module, turning numeric cells into floats."""
+    with open(path, newline='', encoding='utf-8', buffering=CSV_READ_BUFFER) as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        # Convert numeric columns to float for proper sorting in the results table
+        processed_data = []
+        # Repeated text (database names, organisms) shares one string object
+        strings = {}
+        for row in reader:
+            processed_row = []
+            for val in row:
+                try:
+                    processed_row.append(float(val))
+                except ValueError:
+                    processed_row.append(strings.setdefault(val, val))
+            processed_data.append(processed_row)
+    return headers, processed_data
+
+# Looked up once, the thread spinner and presets read it on every rebuild
+CPU_COUNT = os.cpu_count() or 1
+
 class CSVLoaderThread(QThread):
     finished = pyqtSignal(list, list) # headers, data_rows
     error = pyqtSignal(str)
@@ -108,23 +215,173 @@ class CSVLoaderThread(QThread):
 
     def run(self):
         try:
-            with open(self.path, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                data = list(reader)
-                if not data or len(data) < 2:
-                    self.error.emit("Empty or invalid CSV file.")
-                    return
-                # Convert numeric columns to float for proper sorting in QTableWidget
-                processed_data = []
-                for row in data[1:]:
-                    processed_row = []
-                    for val in row:
-                        try:
-                            processed_row.append(float(val))
-                        except ValueError:
-                            processed_row.append(val)
-                    processed_data.append(processed_row)
-                self.finished.emit(data[0], processed_data)
+            try:
+                headers, data = self.read_table()
+            except (ImportError, ValueError):
+                # Neither fast parser is installed, or the file has rows they reject
+                # (ArrowInvalid and pandas' ParserError are ValueErrors); csv takes any file
+                headers, data = parse_csv(self.path)
+            if not headers or not data:
+                self.error.emit("Empty or invalid CSV file.")
+                return
+            self.finished.emit(headers, data)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def read_table(self):
+        # The C/Arrow parsers infer each column type once instead of per cell
+        try:
+            return self.read_arrow()
+        except ImportError:
+            return self.read_pandas()
+
+    def read_arrow(self):
+        import pyarrow as pa
+        import pyarrow.csv as pac
+        import pyarrow.types as pat
+
+        def is_number(t):
+            return pat.is_integer(t) or pat.is_floating(t) or pat.is_decimal(t)
+
+        # Blocks are parsed on Arrow's own thread pool. Only blank cells are nulls,
+        # so text such as "NA" or "null" is kept as written
+        read_options = pac.ReadOptions(use_threads=True, block_size=CSV_READ_BUFFER)
+        table = pac.read_csv(self.path, read_options=read_options,
+                             convert_options=pac.ConvertOptions(null_values=[""], strings_can_be_null=False))
+        # Dates, times and booleans are shown as the file's text, not as Arrow's parsed values
+        inferred = [f.name for f in table.schema
+                    if not (is_number(f.type) or pat.is_string(f.type) or pat.is_large_string(f.type) or pat.is_null(f.type))]
+        if inferred:
+            if len(set(table.column_names)) != table.num_columns:
+                # Columns are re-read by name, repeated headers go to the csv parser
+                raise ValueError("Repeated column names")
+            text = pac.read_csv(self.path, read_options=read_options, convert_options=pac.ConvertOptions(
+                column_types={name: pa.string() for name in inferred}, include_columns=inferred, strings_can_be_null=False))
+            for name in inferred:
+                table = table.set_column(table.schema.get_field_index(name), name, text.column(name))
+        columns = []
+        for column in table.columns:
+            if is_number(column.type):
+                # Numbers are floats for proper sorting in the results table, cast in Arrow rather than per cell
+                values = column.cast(pa.float64(), safe=False).to_pylist()
+                if column.null_count:
+                    # Blanks stay empty
+                    values = ["" if v is None else v for v in values]
+            else:
+                # to_pylist creates one object per cell, repeated values are folded into one
+                strings = {}
+                values = ["" if v is None else strings.setdefault(v, v) for v in column.to_pylist()]
+            columns.append(values)
+        return table.column_names, [list(row) for row in zip(*columns)]
+
+    def read_pandas(self):
+        import pandas as pd
+        with open(self.path, 'rb', buffering=CSV_READ_BUFFER) as f:
+            # Only blank cells are missing, text such as "NA" or "None" is kept as written
+            chunks = pd.read_csv(f, engine='c', chunksize=50000, keep_default_na=False, na_values=[""])
+            df = pd.concat(chunks, ignore_index=True)
+        for name in df.columns:
+            if pd.api.types.is_numeric_dtype(df[name]) and not pd.api.types.is_bool_dtype(df[name]):
+                df[name] = df[name].astype(float)
+        df = df.astype(object).where(df.notna(), "")
+        return [str(h) for h in df.columns], df.values.tolist()
+
+# WORKER FOR INPUT FILE VALIDATION
+
+def validate_file(path):
+    # One raw read of the file head, the first lines are checked without decoding
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            head = os.read(fd, VALIDATE_READ_SIZE)
+        finally:
+            os.close(fd)
+    except OSError:
+        return False
+    for line in head.split(b"\n", 5)[:5]:
+        if line.startswith(b">") or b"LOCUS" in line: return True
+    return False
+
+class FileValidatorThread(QThread):
+    validated = pyqtSignal(list, list) # valid, invalid (in the given order)
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+
+    def run(self):
+        # Reads overlap, so slow (network) mounts cost about one round trip instead of one per file
+        workers = max(1, min(VALIDATE_WORKERS, len(self.paths)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_file, self.paths))
+        valid = [p for p, ok in zip(self.paths, results) if ok]
+        invalid = [p for p, ok in zip(self.paths, results) if not ok]
+        self.validated.emit(valid, invalid)
+
+# WORKER FOR FILTERED CSV EXPORT
+
+class CSVExportThread(QThread):
+    finished = pyqtSignal(str) # path
+    error = pyqtSignal(str)
+
+    def __init__(self, path, headers, rows):
+        super().__init__()
+        self.path = path
+        self.headers = headers
+        # The model swaps in new lists on sort/filter, so this one stays as exported
+        self.rows = rows
+
+    def run(self):
+        try:
+            with open_export(self.path, newline='', buffering=CSV_WRITE_BUFFER) as f:
+                writer = csv.writer(f)
+                writer.writerow(self.headers)
+                # csv.writer already calls str() on each cell, rows go out in slices
+                for start in range(0, len(self.rows), CSV_EXPORT_CHUNK):
+                    writer.writerows(self.rows[start:start + CSV_EXPORT_CHUNK])
+            self.finished.emit(self.path)
+        except Exception as e:
+            self.error.emit(str(e))
+
+# WORKER FOR PDF REPORT EXPORT
+
+class PdfReportThread(QThread):
+    finished = pyqtSignal(str) # path
+    error = pyqtSignal(str)
+
+    def __init__(self, path, total_records, identity, coverage, threads):
+        super().__init__()
+        self.path = path
+        self.total_records = total_records
+        self.identity = identity
+        self.coverage = coverage
+        self.threads = threads
+
+    def run(self):
+        # Only paints on the QPdfWriter, never on widgets, so it is safe off the GUI thread
+        try:
+            from PyQt6.QtGui import QPdfWriter
+            writer = QPdfWriter(self.path)
+            writer.setPageSize(QPdfWriter.PageSize.A4)
+            writer.setResolution(300)
+            painter = QPainter(writer)
+            
+            font_title = QFont("Arial", 20, QFont.Weight.Bold)
+            font_body = QFont("Arial", 12)
+            
+            painter.setFont(font_title)
+            painter.drawText(200, 400, "PanVita 2 - Executive Analysis Report")
+            
+            painter.setFont(font_body)
+            y = 800
+            painter.drawText(200, y, f"Total records analyzed: {self.total_records}")
+            y += 200
+            painter.drawText(200, y, f"Identity Threshold: {self.identity}%  |  Coverage: {self.coverage}%")
+            y += 200
+            painter.drawText(200, y, f"Threads Used: {self.threads}")
+                
+            painter.end()
+            self.finished.emit(self.path)
         except Exception as e:
             self.error.emit(str(e))
 
@@ -189,7 +446,104 @@ class PathConfigDialog(QDialog):
 
 # CUSTOM WIDGETS (Drag & Drop Lists and Tables with Visual Feedback)
 
-class DropListWidget(QListWidget):
+class ShadowWidget(QWidget):
+    """Paints a fixed soft shadow in its margins.
+
+    A QGraphicsDropShadowEffect would render the whole window offscreen and
+    blur it again on every child repaint; these few outlines cost nothing.
+    """
+    def __init__(self, margin, color, parent=None):
+        super().__init__(parent)
+        self.margin = margin
+        # Alpha fades out from the content edge to the window edge
+        self.shadow_pens = []
+        for i in range(1, margin + 1):
+            fade = 1.0 - i / (margin + 1)
+            shade = QColor(color)
+            shade.setAlpha(int(color.alpha() * fade * fade * 0.6))
+            self.shadow_pens.append(shade)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        inner = self.rect().adjusted(self.margin, self.margin, -self.margin, -self.margin)
+        for i, shade in enumerate(self.shadow_pens, start=1):
+            painter.setPen(shade)
+            painter.drawRect(inner.adjusted(-i, -i, i - 1, i - 1))
+        painter.end()
+
+class ScaledImageLabel(QLabel):
+    """Shows a pixmap fitted to the label, never above its native size.
+
+    The scaled copy is made once per size change; setScaledContents would
+    rescale the full image on every repaint.
+    """
+    def __init__(self, text="", parent=None):
+        super().__init__(text, parent)
+        self.source = None
+        self.scaled_for = QSize()
+        # The label follows the viewport instead of the pixmap it shows
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+
+    def set_source(self, pixmap):
+        self.source = pixmap
+        self.scaled_for = QSize()
+        self.rescale()
+
+    def rescale(self):
+        if self.source is None: return
+        target = self.size().boundedTo(self.source.size())
+        if target == self.scaled_for or target.isEmpty(): return
+        self.scaled_for = target
+        self.setPixmap(self.source.scaled(target, Qt.AspectRatioMode.KeepAspectRatio,
+                                          Qt.TransformationMode.SmoothTransformation))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.rescale()
+
+class FileListModel(QAbstractListModel):
+    """Input genomes shown by file name, over the window's own input_files list"""
+    def __init__(self, paths, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        # Membership for de-duplication, kept in step with paths
+        self.known = set(paths)
+
+    def __contains__(self, path):
+        return path in self.known
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(self.paths[index.row()]) if index.isValid() else None
+        if role in (Qt.ItemDataRole.UserRole, Qt.ItemDataRole.ToolTipRole):
+            return self.paths[index.row()] if index.isValid() else None
+        return None
+
+    def add_paths(self, new_paths):
+        # One insert notification for the whole batch
+        if not new_paths: return
+        start = len(self.paths)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_paths) - 1)
+        self.paths.extend(new_paths)
+        self.known.update(new_paths)
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.known.discard(self.paths.pop(row))
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.paths.clear()
+        self.known.clear()
+        self.endResetModel()
+
+class DropListView(QListView):
     def __init__(self, add_file_callback, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
@@ -216,7 +570,7 @@ class DropListWidget(QListWidget):
         files = [u.toLocalFile() for u in event.mimeData().urls() if u.isLocalFile()]
         self.add_file_callback(files)
 
-class DropTableWidget(QTableWidget):
+class DropTableView(QTableView):
     def __init__(self, load_csv_callback, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
@@ -247,25 +601,284 @@ class DropTableWidget(QTableWidget):
         self.load_csv_callback(file_path)
 
 
-# NUMERIC TABLE WIDGET ITEM (For accurate sorting)
-class NumericItem(QTableWidgetItem):
-    def __init__(self, value):
-        super().__init__(str(value))
-        self.value = value
+# RUN HISTORY MODEL
+
+# Rows read from the history table per page
+HISTORY_PAGE_SIZE = 200
+# Above any SQLite rowid, so the first page starts from the newest entry
+HISTORY_NO_ID = (1 << 63) - 1
+# ID, Date, Files, Duration (Status stretches)
+HISTORY_COLUMN_WIDTHS = (60, 150, 90, 90)
+
+class HistoryModel(QAbstractTableModel):
+    """Execution history rows as returned by SQLite, newest first.
 
-    def __lt__(self, other):
-        if isinstance(self.value, float) and isinstance(other.value, float):
-            return self.value < other.value
-        return super().__lt__(other)
+    Older rows are read a page at a time as the view scrolls down, through
+    fetch_page(before_id, limit).
+    """
+    def __init__(self, headers, fetch_page=None, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.fetch_page = fetch_page
+        self.rows = []
+        self.more = False
+
+    def set_rows(self, rows, more=False):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.more = more
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.more and self.fetch_page is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent): return
+        before_id = self.rows[-1][0] if self.rows else HISTORY_NO_ID
+        page = self.fetch_page(before_id, HISTORY_PAGE_SIZE)
+        self.more = len(page) == HISTORY_PAGE_SIZE
+        if not page: return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def prepend(self, row):
+        # A finished task adds one row instead of reloading the table
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.rows.insert(0, row)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return str(self.rows[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+
+# RESULTS TABLE MODEL (Rows stay in the loader's lists, no item per cell)
+
+# Recent filter queries whose row matches are kept
+FILTER_CACHE_SIZE = 16
+
+class ResultsModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.metric_columns = (None, None)
+        # Rows on screen: loaded_rows sorted and filtered
+        self.rows = []
+        self.loaded_rows = []
+        # Ascending row order (indexes into loaded_rows) of each sorted column
+        self.sort_cache = {}
+        self.sort_column = -1
+        self.sort_descending = False
+        self.filter_text = ""
+        # Lowercase text of each loaded row, and the matches of recent filters
+        self.row_text = None
+        self.match_cache = {}
+
+    def set_data(self, headers, rows):
+        self.beginResetModel()
+        self.headers = list(headers)
+        # Detected once per load, re-filters reuse them for the dashboard
+        self.metric_columns = metric_columns(self.headers)
+        # Short rows from the csv parser are padded, so every column index is valid
+        width = len(self.headers)
+        for row in rows:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+        self.rows = list(rows)
+        self.loaded_rows = rows
+        self.sort_cache = {}
+        self.sort_column = -1
+        self.sort_descending = False
+        self.filter_text = ""
+        self.row_text = None
+        self.match_cache = {}
+        self.endResetModel()
+
+    def set_filter(self, text):
+        """Show only rows with a cell containing text (case-insensitive)"""
+        text = text.lower()
+        if text == self.filter_text:
+            return
+        self.filter_text = text
+        self.beginResetModel()
+        self.rows = self.visible_rows()
+        self.endResetModel()
+
+    def matches(self, text):
+        """Flags telling which loaded rows contain text"""
+        if self.row_text is None:
+            # Cells are joined with a separator no typed query contains
+            self.row_text = ["\x1f".join(map(str, row)).lower() for row in self.loaded_rows]
+        if text in self.match_cache:
+            # Backspacing to an earlier query reuses its result
+            return self.match_cache[text]
+        # A query containing a cached one only narrows the rows that one matched
+        base = max((t for t in self.match_cache if t in text), key=len, default=None)
+        if base is not None:
+            base_flags = self.match_cache[base]
+            flags = [f and text in t for f, t in zip(base_flags, self.row_text)]
+        else:
+            flags = [text in t for t in self.row_text]
+        if len(self.match_cache) >= FILTER_CACHE_SIZE:
+            # Dicts keep insertion order, the oldest query goes first
+            del self.match_cache[next(iter(self.match_cache))]
+        self.match_cache[text] = flags
+        return flags
+
+    def visible_rows(self):
+        """Loaded rows in the current sort order, keeping only filter matches"""
+        loaded = self.loaded_rows
+        order = self.sort_cache.get(self.sort_column) if self.sort_column >= 0 else None
+        if order is None:
+            order = range(len(loaded))
+        if self.sort_descending:
+            order = reversed(order)
+        if not self.filter_text:
+            return [loaded[i] for i in order]
+        flags = self.matches(self.filter_text)
+        return [loaded[i] for i in order if flags[i]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # Views ask for a dozen roles per painted cell, the unused ones return before touching the index
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.rows[index.row()][index.column()]) if index.isValid() else None
+        if role == Qt.ItemDataRole.UserRole:
+            return self.rows[index.row()][index.column()] if index.isValid() else None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column < 0 or column >= len(self.headers):
+            return
+        if column not in self.sort_cache:
+            self.sort_cache[column] = self.sort_order(column)
+        self.sort_column = column
+        self.sort_descending = order == Qt.SortOrder.DescendingOrder
+
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self.rows
+        self.rows = self.visible_rows()
+        persistent = self.persistentIndexList()
+        if persistent:
+            # The current index and selection follow their records to the new rows
+            new_row = {id(row): i for i, row in enumerate(self.rows)}
+            self.changePersistentIndexList(persistent, [
+                self.index(new_row[id(old_rows[index.row()])], index.column()) for index in persistent])
+        self.layoutChanged.emit()
+
+    def sort_order(self, column):
+        """Ascending order of the loaded rows by column, as a list of row indexes"""
+        rows = self.loaded_rows
+        # Columns holding a single type (all numbers or all text) compare their
+        # raw values in C; mixed ones put numbers first and compare text as strings
+        kinds = {type(row[column]) for row in rows}
+        if len(kinds) <= 1:
+            keys = list(map(operator.itemgetter(column), rows))
+        else:
+            keys = [(0, row[column], "") if isinstance(row[column], float) else (1, 0.0, str(row[column]))
+                    for row in rows]
+        return sorted(range(len(rows)), key=keys.__getitem__)
+
+# RESULTS METRICS
+
+def find_column(headers, keys):
+    for i, h in enumerate(headers):
+        name = h.lower()
+        if any(k in name for k in keys):
+            return i
+    return None
+
+def metric_columns(headers):
+    """Indexes of the identity and database columns (None when absent)"""
+    return find_column(headers, ("ident", "pident")), find_column(headers, ("database", "db", "banco"))
+
+def compute_metrics(headers, data, columns=None):
+    """Total hits, average identity and most frequent database of the given rows.
+
+    Each column is pulled out once with itemgetter and reduced with builtins
+    (sum, Counter), instead of tallying cell by cell in Python.
+    """
+    metrics = {"hits": len(data), "avg_id": None, "top_db": None}
+    if not data:
+        return metrics
+
+    id_col, db_col = columns if columns is not None else metric_columns(headers)
+    if id_col is not None:
+        values = map(operator.itemgetter(id_col), data)
+        # Only non-negative plain numbers count, as before; the mean is over all hits
+        total_id = sum(v if isinstance(v, float) else float(v) for v in values
+                       if (v >= 0.0 if isinstance(v, float) else str(v).replace('.', '', 1).isdigit()))
+        metrics["avg_id"] = total_id / len(data)
+
+    if db_col is not None:
+        metrics["top_db"] = Counter(map(str, map(operator.itemgetter(db_col), data))).most_common(1)[0][0]
+    return metrics
 
 # DYNAMIC THEME GENERATOR
 
-def get_stylesheet(is_dark_mode, accent_color):
+CHECK_ICON_SVG = "<svg xmlns='http://www.w3.org/2000/svg' width='14' height='14' viewBox='0 0 24 24' fill='none' stroke='{color}' stroke-width='4' stroke-linecap='round' stroke-linejoin='round'><line x1='18' y1='6' x2='6' y2='18'/><line x1='6' y1='6' x2='18' y2='18'/></svg>"
+
+# Private folder (mode 0700) for the indicator icons, made on first use and removed at exit
+_icon_dir = None
+
+def accent_check_icon(accent_color):
+    """Path of the checked indicator icon in the accent color, written again if it was cleaned up"""
+    global _icon_dir
+    svg = CHECK_ICON_SVG.format(color=accent_color)
+    try:
+        # A fresh mkdtemp folder, never a shared fixed name another user could plant
+        if _icon_dir is None or not os.path.isdir(_icon_dir):
+            _icon_dir = tempfile.mkdtemp(prefix="panvita2_icons_")
+            atexit.register(shutil.rmtree, _icon_dir, ignore_errors=True)
+        icon_path = os.path.join(_icon_dir, f"check_{accent_color.lstrip('#').lower()}.svg")
+        if not os.path.exists(icon_path):
+            with open(icon_path, 'w', encoding='utf-8') as f:
+                f.write(svg)
+        # QSS urls take forward slashes on every platform
+        return icon_path.replace(os.sep, "/")
+    except OSError as e:
+        print(f"Could not write the indicator icon: {e}")
+        return "data:image/svg+xml;utf8," + svg.replace('#', '%23')
+
+# Main text color of each theme (dark mode -> color), also the terminal's default log color
+THEME_TEXT_COLORS = {True: "#f8f8f2", False: "#2f3640"}
+
+# Cached per (mode, accent, icon path) so theme and color toggles reuse the built string
+@lru_cache(maxsize=16)
+def get_stylesheet(is_dark_mode, accent_color, svg_x):
     if is_dark_mode:
         bg_main = "#282c34"
         bg_menu = "#1b1b27"
         bg_box = "#21252d"
-        text_main = "#f8f8f2"
+        text_main = THEME_TEXT_COLORS[True]
         text_muted = "#8a95aa"
         border_color = "#44475a"
         hover_color = "#282a36"
@@ -275,17 +888,14 @@ def get_stylesheet(is_dark_mode, accent_color):
         bg_main = "#f5f6fa"
         bg_menu = "#dcdde1"
         bg_box = "#e8e8e8"
-        text_main = "#2f3640"
+        text_main = THEME_TEXT_COLORS[False]
         text_muted = "#718093"
         border_color = "#bdc3c7"
         hover_color = "#ecf0f1"
         input_bg = "#ffffff"
         header_bg = "#bdc3c7"
 
-    accent_encoded = accent_color.replace('#', '%23')
-    svg_x = f"data:image/svg+xml;utf8,<svg xmlns='http://www.w3.org/2000/svg' width='14' height='14' viewBox='0 0 24 24' fill='none' stroke='{accent_encoded}' stroke-width='4' stroke-linecap='round' stroke-linejoin='round'><line x1='18' y1='6' x2='6' y2='18'/><line x1='6' y1='6' x2='18' y2='18'/></svg>"
-
-    return f"""
+    return minify_stylesheet(f"""
     /* ================== GENERAL ================== */
     QWidget {{
         color: {text_main};
@@ -424,14 +1034,14 @@ def get_stylesheet(is_dark_mode, accent_color):
     }}
 
     /* Inputs, Lists, Tables and TextBrowser */
-    QListWidget, QTextEdit, QTableWidget, QTabWidget::pane, QTextBrowser {{
+    QListView, QTextEdit, QPlainTextEdit, QTableView, QTabWidget::pane, QTextBrowser {{
         background-color: {input_bg};
         border: 1px solid {border_color};
         border-radius: 5px;
         padding: 5px;
         gridline-color: {border_color};
     }}
-    QTextEdit {{
+    QTextEdit, QPlainTextEdit {{
         color: {accent_color};
         font-family: Consolas, monospace;
     }}
@@ -562,7 +1172,32 @@ def get_stylesheet(is_dark_mode, accent_color):
         font-weight: bold;
         color: {accent_color};
     }}
-    """
+    """)
+
+# Comments and runs of whitespace outside quoted strings (the check icon url may hold spaces)
+QSS_NOISE = re.compile(r"""("[^"]*"|'[^']*')|/\*.*?\*/|\s+""", re.S)
+
+def minify_stylesheet(qss):
+    """Drop comments and collapse whitespace, so setStyleSheet has less to tokenize"""
+    return QSS_NOISE.sub(lambda m: m.group(1) or ("" if m.group(0).startswith("/*") else " "), qss).strip()
+
+# Database checkboxes (core flag, label) and NCBI options (flag, default label, translation key)
+DB_OPTIONS = (
+    ("-card", "CARD"), ("-bacmet", "BacMet"),
+    ("-vfdb", "VFDB"), ("-megares", "MEGARes"),
+    ("-resfinder", "ResFinder"), ("-argannot", "ARG-ANNOT"),
+    ("-victors", "Victors (Prot)"), ("-victors-nucl", "Victors (Nucl)"),
+)
+NCBI_OPTIONS = (
+    ("-b", "Download GenBank (-b)", "cb_b"),
+    ("-a", "Annotate via PROKKA (-a)", "cb_a"),
+    ("-g", "Download FASTA (-g)", "cb_g"),
+    ("-m", "Download Metadata (-m)", "cb_m"),
+    ("-s", "Locus_Tag matches strain (-s)", "cb_s"),
+)
+
+# Menu icons removed from a button label to build the page title
+PAGE_TITLE_STRIP = str.maketrans('', '', '≡🗄🧬🌐💻📊📝📖')
 
 class PanVitaApp(QMainWindow):
     def __init__(self):
@@ -577,18 +1212,31 @@ class PanVitaApp(QMainWindow):
         self.accent_color = self.settings.value("accent_color", "#bd93f9", type=str)
         self.last_dir = self.settings.value("last_dir", "", type=str)
         self.lang = self.settings.value("lang", "EN", type=str)
+        # Current language strings, re-bound by apply_language
+        self.strings = LANGUAGES[self.lang]
 
         # State Variables
         self.dragPos = QPoint()
+        self.system_move = False
         self.input_files = []
         self.csv_file = ""
         self.custom_db_path = ""
         self.process = None 
         self.csv_thread = None
+        self.pdf_thread = None
+        self.export_thread = None
+        self.validator_threads = []
         self.current_run_results = None
+        self.logo_path = None
+        self.logo_pixmaps = {}
+        # Last graph image opened, as ((path, mtime), pixmap)
+        self.graph_pixmap = None
+        self.preflight_cache = {}
         
         # Queue System
-        self.task_queue = []
+        self.task_queue = deque()
+        # Numbers the queue labels, so removing finished tasks never relabels the rest
+        self.queued_task_count = 0
         self.is_processing_queue = False
         self.current_task_start_time = None
 
@@ -619,25 +1267,42 @@ class PanVitaApp(QMainWindow):
         db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "panvita_history.db")
         self.conn = sqlite3.connect(db_path)
         self.cursor = self.conn.cursor()
-        self.cursor.execute('''CREATE TABLE IF NOT EXISTS history 
-                             (id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                              date TEXT, 
-                              files TEXT, 
-                              dbs TEXT, 
-                              duration TEXT, 
-                              status TEXT)''')
-        self.conn.commit()
+        # WAL keeps history writes from syncing the whole file on every commit
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        with self.conn:
+            self.cursor.execute('''CREATE TABLE IF NOT EXISTS history 
+                                 (id INTEGER PRIMARY KEY AUTOINCREMENT, 
+                                  date TEXT, 
+                                  files TEXT, 
+                                  dbs TEXT, 
+                                  duration TEXT, 
+                                  status TEXT)''')
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_date ON history(date)")
 
     def load_logo_pixmap(self, size):
+        # Each size is decoded straight to that size once, no full-size image stays in memory
+        if size in self.logo_pixmaps:
+            return self.logo_pixmaps[size]
+        if self.logo_path is None:
+            self.logo_path = self.find_logo_path()
+        pix = QPixmap()
+        if self.logo_path:
+            reader = QImageReader(self.logo_path)
+            reader.setScaledSize(QSize(size, size))
+            img = reader.read()
+            if not img.isNull(): pix = QPixmap.fromImage(img)
+        self.logo_pixmaps[size] = pix
+        return pix
+
+    def find_logo_path(self):
         for ext in ["png", "jpg", "jpeg"]:
             logo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"logo.{ext}")
-            if os.path.exists(logo_path):
-                reader = QImageReader(logo_path)
-                reader.setScaledSize(QSize(size, size))
-                img = reader.read()
-                if not img.isNull():
-                    return QPixmap.fromImage(img)
-        return QPixmap()
+            # canRead only checks the header
+            if os.path.exists(logo_path) and QImageReader(logo_path).canRead():
+                return logo_path
+        return ""
 
     def setup_shortcuts(self):
         QShortcut(QKeySequence("Ctrl+R"), self).activated.connect(self.toggle_run_state)
@@ -646,12 +1311,22 @@ class PanVitaApp(QMainWindow):
         QShortcut(QKeySequence("Ctrl+S"), self).activated.connect(self.save_preset)
 
     def apply_theme(self):
-        stylesheet = get_stylesheet(self.is_dark_mode, self.accent_color)
-        self.central_widget.setStyleSheet(stylesheet)
+        # The icon file is checked on every call, a new path also means a new sheet
+        svg_x = accent_check_icon(str(self.accent_color))
+        stylesheet = get_stylesheet(bool(self.is_dark_mode), str(self.accent_color), svg_x)
+        # Re-applying an identical sheet still repolishes every widget
+        if self.central_widget.styleSheet() != stylesheet:
+            self.central_widget.setStyleSheet(stylesheet)
+        # Default log color from the theme itself; the palette only picks up the
+        # stylesheet once the widgets are polished, after this first call
+        self.log_text_color = THEME_TEXT_COLORS[bool(self.is_dark_mode)]
         self.populate_help_page() 
 
     def apply_language(self):
-        t = LANGUAGES[self.lang]
+        t = self.strings = LANGUAGES[self.lang]
+        # Metric tiles only substitute the value on each refresh
+        self.metric_templates = {key: t[key] + "<span id='MetricVal'>{}</span>"
+                                 for key in ("metrics_hits", "metrics_id", "metrics_db")}
         
         # Sidebar
         self.btn_home.setText(t["menu_home"])
@@ -703,11 +1378,8 @@ class PanVitaApp(QMainWindow):
         # NCBI Page
         self.gb_ncbi.setTitle(t["gb_ncbi"])
         self.btn_csv.setText(t["btn_csv"])
-        self.ncbi_cbs["-b"].setText(t["cb_b"])
-        self.ncbi_cbs["-a"].setText(t["cb_a"])
-        self.ncbi_cbs["-g"].setText(t["cb_g"])
-        self.ncbi_cbs["-m"].setText(t["cb_m"])
-        self.ncbi_cbs["-s"].setText(t["cb_s"])
+        for flag, _, text_key in NCBI_OPTIONS:
+            self.ncbi_cbs[flag].setText(t[text_key])
         
         self.gb_out.setTitle(t["gb_out"])
         self.rb_pdf.setText(t["rb_pdf"])
@@ -737,12 +1409,12 @@ class PanVitaApp(QMainWindow):
 
         # Update current top title
         current_idx = self.stacked_widget.currentIndex()
-        for btn in self.nav_group.buttons():
-            if self.nav_group.id(btn) == current_idx:
-                self.set_page(current_idx, btn.text())
-                break
+        btn = self.nav_group.button(current_idx)
+        if btn is not None:
+            self.set_page(current_idx, btn.text())
 
     def change_accent_color(self):
+        from PyQt6.QtWidgets import QColorDialog
         color = QColorDialog.getColor(QColor(self.accent_color), self, "Select Accent Color")
         if color.isValid():
             self.accent_color = color.name()
@@ -760,6 +1432,7 @@ class PanVitaApp(QMainWindow):
     def open_path_config(self):
         dlg = PathConfigDialog(self)
         if dlg.exec():
+            self.preflight_cache.clear()
             self.run_preflight_check()
 
     def closeEvent(self, event):
@@ -776,14 +1449,24 @@ class PanVitaApp(QMainWindow):
     
     # PRE-FLIGHT CHECK
     
+    def tool_exists(self, path, check_file=True, search_path=True):
+        # Cached for a few seconds (and until paths are reconfigured), so language toggles
+        # reuse the lookups while tools installed meanwhile are still picked up
+        key = (path, check_file, search_path)
+        now = time.monotonic()
+        cached = self.preflight_cache.get(key)
+        if cached is not None and now - cached[0] < PREFLIGHT_CACHE_TTL:
+            return cached[1]
+        found = ((check_file and os.path.exists(path)) or
+                 (search_path and shutil.which(path) is not None))
+        self.preflight_cache[key] = (now, found)
+        return found
+
     def run_preflight_check(self):
-        status_lines = [LANGUAGES[self.lang]["sys_check"]]
+        status_lines = [self.strings["sys_check"]]
         
         panvita_path = self.settings.value("path_panvita", "panvita.py", type=str)
-        if os.path.exists(panvita_path) or shutil.which(panvita_path):
-            status_lines.append(f"• PanVita Core: <span style='color:#50fa7b;'>✅ Found</span>")
-        else:
-            status_lines.append(f"• PanVita Core: <span style='color:#ff5555;'>❌ Missing</span>")
+        status_lines.append(f"• PanVita Core: {STATUS_BADGES['found' if self.tool_exists(panvita_path) else 'missing']}")
 
         tools = [("BLAST", "dir_blast", "blastp"), ("DIAMOND", "dir_diamond", "diamond"), ("PROKKA", "dir_prokka", "prokka")]
 
@@ -792,33 +1475,28 @@ class PanVitaApp(QMainWindow):
             if directory and os.path.isdir(directory):
                 target_exe = os.path.join(directory, exe_name)
                 if os.name == 'nt' and not target_exe.endswith('.exe'): target_exe += '.exe'
-                if os.path.exists(target_exe):
-                    status_lines.append(f"• {name}: <span style='color:#50fa7b;'>✅ Custom</span>")
-                else:
-                    status_lines.append(f"• {name}: <span style='color:#ff5555;'>❌ Custom Fail</span>")
+                badge = 'custom' if self.tool_exists(target_exe, search_path=False) else 'custom_fail'
             else:
-                if shutil.which(exe_name):
-                    status_lines.append(f"• {name}: <span style='color:#50fa7b;'>✅ System PATH</span>")
-                else:
-                    status_lines.append(f"• {name}: <span style='color:#ff5555;'>❌ Missing</span>")
+                badge = 'system_path' if self.tool_exists(exe_name, check_file=False) else 'missing'
+            status_lines.append(f"• {name}: {STATUS_BADGES[badge]}")
         
-        if PSUTIL_AVAILABLE:
-            status_lines.append(f"• HW Monitor: <span style='color:#50fa7b;'>✅ Active</span>")
-        else:
-            status_lines.append(f"• HW Monitor: <span style='color:#f1fa8c;'>⚠️ pip install psutil</span>")
+        status_lines.append(f"• HW Monitor: {STATUS_BADGES['hw_active' if PSUTIL_AVAILABLE else 'hw_missing']}")
             
-        self.lbl_sys_check.setText("<br>".join(status_lines))
-
-    def validate_file(self, path):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for _ in range(5):
-                    line = f.readline()
-                    if not line: break
-                    if line.startswith(">") or "LOCUS" in line: return True
-            return False
-        except: 
-            return False
+        status_html = "<br>".join(status_lines)
+        # Re-checks usually give the same result, the label only re-lays out on a change
+        if self.lbl_sys_check.text() != status_html:
+            self.lbl_sys_check.setText(status_html)
+
+    def ask_open_path(self, title, file_filter):
+        # Remembers the folder for the next dialog
+        path, _ = QFileDialog.getOpenFileName(self, title, self.last_dir, file_filter)
+        if path: self.last_dir = os.path.dirname(path)
+        return path
+
+    def ask_save_path(self, title, file_filter):
+        path, _ = QFileDialog.getSaveFileName(self, title, self.last_dir, file_filter)
+        if path: self.last_dir = os.path.dirname(path)
+        return path
 
     def save_preset(self):
         preset = {
@@ -826,28 +1504,26 @@ class PanVitaApp(QMainWindow):
             "threads": self.spn_threads.value(),
             "databases": {k: v.isChecked() for k, v in self.db_checkboxes.items()},
             "ncbi": {k: v.isChecked() for k, v in self.ncbi_cbs.items()},
-            "aligner": { "-diamond": self.rb_diamond.isChecked(), "-blast": self.rb_blast.isChecked(), "-both": self.rb_both.isChecked() },
+            "aligner": {flag: rb.isChecked() for flag, rb in self.aligner_rbs.items()},
             "force_d": self.cb_force_d.isChecked(),
             "outputs": { "pdf": self.rb_pdf.isChecked(), "png": self.rb_png.isChecked(), "save_genes": self.cb_save.isChecked(), "keep_temp": self.cb_keep.isChecked() }
         }
-        path, _ = QFileDialog.getSaveFileName(self, "Save Preset", self.last_dir, "JSON Files (*.json)")
+        path = self.ask_save_path("Save Preset", "JSON Files (*.json)")
         if path:
-            self.last_dir = os.path.dirname(path)
             try:
-                with open(path, 'w', encoding='utf-8') as f: json.dump(preset, f, indent=4)
+                write_atomic(path, json_dumps(preset))
                 QMessageBox.information(self, "Success", "Preset saved successfully.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not save preset:\n{str(e)}")
 
     def load_preset(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Load Preset", self.last_dir, "JSON Files (*.json)")
+        path = self.ask_open_path("Load Preset", "JSON Files (*.json)")
         if path:
-            self.last_dir = os.path.dirname(path)
             try:
-                with open(path, 'r', encoding='utf-8') as f: preset = json.load(f)
+                with open(path, 'rb') as f: preset = json_loads(f.read())
                 self.spn_i.setValue(preset.get("identity", 70))
                 self.spn_c.setValue(preset.get("coverage", 70))
-                self.spn_threads.setValue(preset.get("threads", multiprocessing.cpu_count()))
+                self.spn_threads.setValue(preset.get("threads", CPU_COUNT))
                 
                 for k, v in preset.get("databases", {}).items():
                     if k in self.db_checkboxes: self.db_checkboxes[k].setChecked(v)
@@ -855,10 +1531,9 @@ class PanVitaApp(QMainWindow):
                     if k in self.ncbi_cbs: self.ncbi_cbs[k].setChecked(v)
                 
                 aligners = preset.get("aligner", {})
-                if aligners.get("-diamond"): self.rb_diamond.setChecked(True)
-                elif aligners.get("-blast"): self.rb_blast.setChecked(True)
-                elif aligners.get("-both"): self.rb_both.setChecked(True)
-                else: self.rb_auto.setChecked(True)
+                # Checking one button of the exclusive group unchecks the others
+                active = next((rb for flag, rb in self.aligner_rbs.items() if aligners.get(flag)), self.rb_auto)
+                active.setChecked(True)
                 
                 self.cb_force_d.setChecked(preset.get("force_d", False))
                 outputs = preset.get("outputs", {})
@@ -874,15 +1549,8 @@ class PanVitaApp(QMainWindow):
     # NITIALIZATION
     
     def init_ui(self):
-        self.central_widget = QWidget()
+        self.central_widget = ShadowWidget(10, QColor(0, 0, 0, 160))
         self.central_widget.setObjectName("CentralWidget")
-        
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(20)
-        shadow.setXOffset(0)
-        shadow.setYOffset(0)
-        shadow.setColor(QColor(0, 0, 0, 160))
-        self.central_widget.setGraphicsEffect(shadow)
 
         self.setCentralWidget(self.central_widget)
         main_layout = QHBoxLayout(self.central_widget)
@@ -933,7 +1601,9 @@ class PanVitaApp(QMainWindow):
         self.btn_queue = self.create_menu_button("  Queue & History", 6)
         self.btn_help = self.create_menu_button("  Help & Documentation", 7)
 
-        for btn in [self.btn_home, self.btn_db, self.btn_align, self.btn_ncbi, self.btn_term, self.btn_res, self.btn_queue, self.btn_help]:
+        # One connection for the whole menu, routed by button id
+        self.nav_group.idClicked.connect(self.on_menu_clicked)
+        for btn in self.nav_group.buttons():
             left_menu_layout.addWidget(btn)
         left_menu_layout.addStretch()
 
@@ -1072,7 +1742,9 @@ class PanVitaApp(QMainWindow):
         self.build_page_terminal()
         self.build_page_results()
         self.build_page_queue_history()
-        self.build_page_help()
+        # Content-only pages are filled in the first time they are opened
+        self.lazy_pages = {}
+        self.add_lazy_page(self.build_page_help)
 
         # BOTTOM BAR WITH PROGRESS AND HW MONITORS
         bottom_bar = QFrame()
@@ -1126,18 +1798,46 @@ class PanVitaApp(QMainWindow):
         self.btn_home.setChecked(True)
 
     def update_hardware_monitor(self):
-        if PSUTIL_AVAILABLE:
-            self.cpu_bar.setValue(int(psutil.cpu_percent()))
-            self.ram_bar.setValue(int(psutil.virtual_memory().percent))
+        global psutil, PSUTIL_AVAILABLE
+        if not PSUTIL_AVAILABLE: return
+        # Nothing to refresh while the bars can't be seen
+        if self.isMinimized() or not self.cpu_bar.isVisible(): return
+        if psutil is None:
+            try:
+                import psutil
+            except ImportError:
+                # Installed but not loadable (e.g. a broken binary wheel), stop polling
+                PSUTIL_AVAILABLE = False
+                self.hw_timer.stop()
+                self.run_preflight_check()
+                return
+            # The first non-blocking reading only sets the baseline for the next tick
+            psutil.cpu_percent(interval=None)
+            return
+        cpu = int(psutil.cpu_percent(interval=None))
+        ram = int(psutil.virtual_memory().percent)
+        changed = [(bar, val) for bar, val in ((self.cpu_bar, cpu), (self.ram_bar, ram)) if bar.value() != val]
+        # setValue repaints right away, with updates paused both bars share one queued paint
+        for bar, val in changed:
+            bar.setUpdatesEnabled(False)
+            bar.blockSignals(True)
+            bar.setValue(val)
+            bar.blockSignals(False)
+        for bar, val in changed:
+            bar.setUpdatesEnabled(True)
 
     # FRAMELESS WINDOW EVENTS
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton: 
+            # The window manager moves the window natively when it supports it,
+            # otherwise the window follows the mouse events below
+            handle = self.windowHandle()
+            self.system_move = handle is not None and handle.startSystemMove()
             self.dragPos = event.globalPosition().toPoint()
 
     def mouseMoveEvent(self, event):
-        if event.buttons() == Qt.MouseButton.LeftButton:
+        if event.buttons() == Qt.MouseButton.LeftButton and not self.system_move:
             self.move(self.pos() + event.globalPosition().toPoint() - self.dragPos)
             self.dragPos = event.globalPosition().toPoint()
             event.accept()
@@ -1151,12 +1851,22 @@ class PanVitaApp(QMainWindow):
         btn.setCheckable(True)
         btn.setFixedHeight(45)
         self.nav_group.addButton(btn, index)
-        btn.clicked.connect(lambda: self.set_page(index, btn.text()))
         return btn
 
+    def on_menu_clicked(self, index):
+        self.set_page(index, self.nav_group.button(index).text())
+
+    def add_lazy_page(self, builder):
+        page = QWidget()
+        index = self.stacked_widget.addWidget(page)
+        self.lazy_pages[index] = (builder, page)
+
     def set_page(self, index, title):
+        if index in self.lazy_pages:
+            builder, page = self.lazy_pages.pop(index)
+            builder(page)
         self.stacked_widget.setCurrentIndex(index)
-        clean_title = title.replace('  ', '').replace('≡', '').replace('🗄', '').replace('🧬', '').replace('🌐', '').replace('💻', '').replace('📊', '').replace('📝', '').replace('📖', '').strip()
+        clean_title = title.replace('  ', '').translate(PAGE_TITLE_STRIP).strip()
         self.lbl_top_title.setText(f"PanVita 2 - {clean_title}")
 
 
@@ -1216,9 +1926,12 @@ class PanVitaApp(QMainWindow):
         h_btn.addWidget(self.btn_clear)
         h_btn.addStretch()
 
-        self.list_files = DropListWidget(self.add_file_paths)
+        self.file_model = FileListModel(self.input_files, self)
+        self.list_files = DropListView(self.add_file_paths)
+        self.list_files.setModel(self.file_model)
+        self.list_files.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.list_files.setFixedHeight(120)
-        self.list_files.itemDoubleClicked.connect(self.remove_selected_file)
+        self.list_files.doubleClicked.connect(self.remove_selected_file)
 
         l_files.addLayout(h_btn)
         l_files.addWidget(self.list_files)
@@ -1227,12 +1940,7 @@ class PanVitaApp(QMainWindow):
         self.gb_db = QGroupBox("Target Databases")
         l_db = QGridLayout(self.gb_db)
 
-        self.db_checkboxes = {
-            "-card": QCheckBox("CARD"), "-bacmet": QCheckBox("BacMet"),
-            "-vfdb": QCheckBox("VFDB"), "-megares": QCheckBox("MEGARes"),
-            "-resfinder": QCheckBox("ResFinder"), "-argannot": QCheckBox("ARG-ANNOT"),
-            "-victors": QCheckBox("Victors (Prot)"), "-victors-nucl": QCheckBox("Victors (Nucl)")
-        }
+        self.db_checkboxes = {flag: QCheckBox(label) for flag, label in DB_OPTIONS}
 
         r, c = 0, 0
         for flag, cb in self.db_checkboxes.items():
@@ -1268,12 +1976,14 @@ class PanVitaApp(QMainWindow):
         self.rb_diamond = QRadioButton("DIAMOND Only (-diamond)")
         self.rb_blast = QRadioButton("BLAST Only (-blast)")
         self.rb_both = QRadioButton("Both DIAMOND and BLAST (-both)")
+        # Core flag of each explicit aligner choice, Automatic passes none
+        self.aligner_rbs = {"-diamond": self.rb_diamond, "-blast": self.rb_blast, "-both": self.rb_both}
         self.cb_force_d = QCheckBox("Force Local DIAMOND (-d)")
         
         self.lbl_threads = QLabel("CPU Threads:")
         self.spn_threads = QSpinBox()
-        self.spn_threads.setRange(1, multiprocessing.cpu_count())
-        self.spn_threads.setValue(multiprocessing.cpu_count())
+        self.spn_threads.setRange(1, CPU_COUNT)
+        self.spn_threads.setValue(CPU_COUNT)
 
         l_alg.addWidget(self.rb_auto, 0, 0)
         l_alg.addWidget(self.rb_diamond, 0, 1)
@@ -1332,13 +2042,7 @@ class PanVitaApp(QMainWindow):
         h_csv.addStretch()
         l_ncbi.addLayout(h_csv)
 
-        self.ncbi_cbs = {
-            "-b": QCheckBox("Download GenBank (-b)"), 
-            "-a": QCheckBox("Annotate via PROKKA (-a)"),
-            "-g": QCheckBox("Download FASTA (-g)"), 
-            "-m": QCheckBox("Download Metadata (-m)"),
-            "-s": QCheckBox("Locus_Tag matches strain (-s)")
-        }
+        self.ncbi_cbs = {flag: QCheckBox(label) for flag, label, _ in NCBI_OPTIONS}
 
         for cb in self.ncbi_cbs.values(): 
             l_ncbi.addWidget(cb)
@@ -1366,7 +2070,7 @@ class PanVitaApp(QMainWindow):
         
         h_btn = QHBoxLayout()
         self.btn_clear_term = QPushButton(" Clear Terminal")
-        self.btn_clear_term.clicked.connect(lambda: self.terminal.clear())
+        self.btn_clear_term.clicked.connect(self.clear_terminal)
         self.btn_export_log = QPushButton(" Export Log as .TXT")
         self.btn_export_log.clicked.connect(self.export_log)
         
@@ -1375,10 +2079,19 @@ class PanVitaApp(QMainWindow):
         h_btn.addWidget(self.btn_export_log)
         layout.addLayout(h_btn)
 
-        self.terminal = QTextEdit()
+        # Plain text layout per block instead of rich text, old lines are evicted past the cap
+        self.terminal = QPlainTextEdit()
         self.terminal.setReadOnly(True)
-        self.terminal.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.terminal.setUndoRedoEnabled(False)
+        self.terminal.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.terminal.setMaximumBlockCount(TERMINAL_MAX_BLOCKS)
         layout.addWidget(self.terminal)
+
+        self.term_buffer = []
+        self.term_timer = QTimer(self)
+        self.term_timer.setSingleShot(True)
+        self.term_timer.setInterval(TERMINAL_FLUSH_MS)
+        self.term_timer.timeout.connect(self.flush_terminal)
         self.stacked_widget.addWidget(page)
 
     def build_page_results(self):
@@ -1428,7 +2141,13 @@ class PanVitaApp(QMainWindow):
         self.lbl_search_table = QLabel("🔍 Filter Results:")
         self.le_search_table = QLineEdit()
         self.le_search_table.setPlaceholderText("Type a gene name, identity, etc...")
-        self.le_search_table.textChanged.connect(self.filter_results_table)
+        # Filter once typing pauses instead of on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(lambda: self.filter_results_table(self.le_search_table.text()))
+        self.le_search_table.textChanged.connect(self.filter_timer.start)
+        self.le_search_table.returnPressed.connect(self.apply_filter_now)
         
         self.lbl_row_count = QLabel("Rows: 0/0")
         self.lbl_row_count.setObjectName("TitleLeftDescription")
@@ -1438,11 +2157,19 @@ class PanVitaApp(QMainWindow):
         h_search.addWidget(self.lbl_row_count)
         layout_table.addLayout(h_search)
         
-        self.res_table = DropTableWidget(self.execute_load_csv)
+        self.res_model = ResultsModel(self)
+        self.res_table = DropTableView(self.execute_load_csv)
+        self.res_table.setModel(self.res_model)
         self.res_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.res_table.setAlternatingRowColors(True)
+        # Sorting stays on, the model keeps its own sort across reloads and filters
+        self.res_table.setSortingEnabled(True)
         self.res_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.res_table.horizontalHeader().setStretchLastSection(True)
+        # Columns keep a fixed width on load, fitting is on request from the context menu
+        # and measures the rows on screen, not every loaded row
+        self.res_table.horizontalHeader().setResizeContentsPrecision(0)
+        self.res_table.horizontalHeader().setDefaultSectionSize(120)
         self.res_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.res_table.customContextMenuRequested.connect(self.show_table_context_menu)
         
@@ -1453,7 +2180,7 @@ class PanVitaApp(QMainWindow):
         layout_graph_png = QVBoxLayout(self.tab_graph_png)
         self.btn_load_graph = QPushButton("🖼 Load PNG Graph")
         self.btn_load_graph.clicked.connect(self.load_graph_png)
-        self.lbl_graph_view = QLabel("No graph loaded.")
+        self.lbl_graph_view = ScaledImageLabel("No graph loaded.")
         self.lbl_graph_view.setAlignment(Qt.AlignmentFlag.AlignCenter)
         scroll_graph = QScrollArea()
         scroll_graph.setWidgetResizable(True)
@@ -1470,10 +2197,13 @@ class PanVitaApp(QMainWindow):
             layout_graph_html = QVBoxLayout(self.tab_graph_html)
             self.btn_load_html = QPushButton("🌐 Load Interactive HTML Graph")
             self.btn_load_html.clicked.connect(self.load_graph_html)
-            self.web_view = QWebEngineView()
-            self.web_view.setHtml("<div style='display:flex; justify-content:center; align-items:center; height:100%; color:gray; font-family:sans-serif;'>No interactive HTML graph loaded.</div>")
+            # The web view is created when the first graph is loaded
+            self.web_view = None
+            self.lbl_html_placeholder = QLabel("No interactive HTML graph loaded.")
+            self.lbl_html_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.lbl_html_placeholder.setStyleSheet("color: gray;")
             layout_graph_html.addWidget(self.btn_load_html, alignment=Qt.AlignmentFlag.AlignLeft)
-            layout_graph_html.addWidget(self.web_view)
+            layout_graph_html.addWidget(self.lbl_html_placeholder, 1)
             self.tabs_res.addTab(self.tab_graph_html, "Interactive Graphs (HTML)")
         
         layout.addWidget(self.tabs_res)
@@ -1490,7 +2220,10 @@ class PanVitaApp(QMainWindow):
         self.gb_queue = QGroupBox("Task Queue")
         l_queue = QVBoxLayout(self.gb_queue)
         
-        self.list_queue = QListWidget()
+        self.queue_model = QStringListModel(self)
+        self.list_queue = QListView()
+        self.list_queue.setModel(self.queue_model)
+        self.list_queue.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         l_queue.addWidget(self.list_queue)
         
         h_q_btns = QHBoxLayout()
@@ -1504,11 +2237,14 @@ class PanVitaApp(QMainWindow):
         self.gb_history = QGroupBox("Run History")
         l_history = QVBoxLayout(self.gb_history)
         
-        self.table_history = QTableWidget()
-        self.table_history.setColumnCount(5)
-        self.table_history.setHorizontalHeaderLabels(["ID", "Date", "Files", "Duration", "Status"])
+        self.history_model = HistoryModel(["ID", "Date", "Files", "Duration", "Status"], self.fetch_history_page, self)
+        self.table_history = QTableView()
+        self.table_history.setModel(self.history_model)
         self.table_history.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table_history.horizontalHeader().setStretchLastSection(True)
+        # Fixed widths, so new rows never trigger a measuring pass over the history
+        for col, width in enumerate(HISTORY_COLUMN_WIDTHS):
+            self.table_history.horizontalHeader().resizeSection(col, width)
         l_history.addWidget(self.table_history)
         
         h_h_btns = QHBoxLayout()
@@ -1524,16 +2260,25 @@ class PanVitaApp(QMainWindow):
         
         self.stacked_widget.addWidget(page)
 
-    def build_page_help(self):
-        page = QWidget()
+    def build_page_help(self, page):
         layout = QVBoxLayout(page)
         layout.setContentsMargins(20, 20, 20, 20)
         self.text_browser_help = QTextBrowser()
         self.text_browser_help.setOpenExternalLinks(True)
+        self.help_docs = {}
         layout.addWidget(self.text_browser_help)
-        self.stacked_widget.addWidget(page)
+        self.populate_help_page()
 
     def populate_help_page(self):
+        # Not built yet, it is filled when the Help page is first opened
+        if not hasattr(self, 'text_browser_help'): return
+        # Parsed documents are kept per accent and language, theme toggles and
+        # switching languages back only swap the document
+        key = (self.accent_color, self.lang)
+        if self.text_browser_help.document() is self.help_docs.get(key): return
+        if key in self.help_docs:
+            self.text_browser_help.setDocument(self.help_docs[key])
+            return
         color = self.accent_color
         
         html_pt = f"""
@@ -1630,8 +2375,11 @@ class PanVitaApp(QMainWindow):
         </ol>
         """
 
-        if hasattr(self, 'text_browser_help'):
-            self.text_browser_help.setHtml(html_en if self.lang == "EN" else html_pt)
+        doc = QTextDocument(self.text_browser_help)
+        doc.setDefaultFont(self.text_browser_help.font())
+        doc.setHtml(html_en if self.lang == "EN" else html_pt)
+        self.help_docs[key] = doc
+        self.text_browser_help.setDocument(doc)
 
     # DATA HANDLING LOGIC
 
@@ -1644,36 +2392,37 @@ class PanVitaApp(QMainWindow):
             self.add_file_paths(files)
 
     def add_file_paths(self, files):
-        for f in files:
-            if not self.validate_file(f):
-                QMessageBox.warning(self, "Invalid File", f"The file '{os.path.basename(f)}' does not appear to be a valid FASTA or GenBank file.")
-                continue
-            if f not in self.input_files:
-                self.input_files.append(f)
-                item = QListWidgetItem(os.path.basename(f))
-                item.setData(Qt.ItemDataRole.UserRole, f)
-                self.list_files.addItem(item)
-
-    def remove_selected_file(self, item):
-        f_path = item.data(Qt.ItemDataRole.UserRole)
-        if f_path in self.input_files: self.input_files.remove(f_path)
-        self.list_files.takeItem(self.list_files.row(item))
+        # dict.fromkeys also drops repeats within the same drop, keeping order
+        files = [f for f in dict.fromkeys(files) if f not in self.file_model]
+        if not files: return
+        thread = FileValidatorThread(files)
+        thread.validated.connect(self.on_files_validated)
+        # The reference is kept until the thread has really stopped
+        thread.finished.connect(lambda: self.validator_threads.remove(thread))
+        self.validator_threads.append(thread)
+        thread.start()
+
+    def on_files_validated(self, valid, invalid):
+        for f in invalid:
+            QMessageBox.warning(self, "Invalid File", f"The file '{os.path.basename(f)}' does not appear to be a valid FASTA or GenBank file.")
+        # Files may have been added by another drop while this batch was checked
+        self.file_model.add_paths([f for f in dict.fromkeys(valid) if f not in self.file_model])
+
+    def remove_selected_file(self, index):
+        if index.isValid(): self.file_model.remove_row(index.row())
 
     def clear_files(self):
-        self.input_files.clear()
-        self.list_files.clear()
+        self.file_model.clear()
 
     def select_custom_db(self):
-        f, _ = QFileDialog.getOpenFileName(self, "Select Custom DB", self.last_dir, "FASTA (*.fasta *.fas *.fna *.faa)")
+        f = self.ask_open_path("Select Custom DB", "FASTA (*.fasta *.fas *.fna *.faa)")
         if f:
-            self.last_dir = os.path.dirname(f)
             self.custom_db_path = f
             self.lbl_custom.setText(os.path.basename(f))
 
     def select_csv(self):
-        f, _ = QFileDialog.getOpenFileName(self, "NCBI Table Import", self.last_dir, "Tables (*.csv *.tsv *.txt)")
+        f = self.ask_open_path("NCBI Table Import", "Tables (*.csv *.tsv *.txt)")
         if f:
-            self.last_dir = os.path.dirname(f)
             self.csv_file = f
             self.lbl_csv.setText(os.path.basename(f))
 
@@ -1696,158 +2445,142 @@ class PanVitaApp(QMainWindow):
             "dbs": [flag for flag, cb in self.db_checkboxes.items() if cb.isChecked()]
         }
         self.task_queue.append(task_info)
+        self.queued_task_count += 1
         
-        display_text = f"Task {len(self.task_queue)}: {len(self.input_files)} files against {', '.join(task_info['dbs'])}"
-        self.list_queue.addItem(display_text)
+        display_text = f"Task {self.queued_task_count}: {len(self.input_files)} files against {', '.join(task_info['dbs'])}"
+        row = self.queue_model.rowCount()
+        self.queue_model.insertRows(row, 1)
+        self.queue_model.setData(self.queue_model.index(row), display_text)
         QMessageBox.information(self, "Queue", "Task added to Queue.")
 
     def clear_queue(self):
         self.task_queue.clear()
-        self.list_queue.clear()
+        self.queued_task_count = 0
+        self.queue_model.setStringList([])
         
     def load_history(self):
-        self.cursor.execute("SELECT id, date, files, duration, status FROM history ORDER BY id DESC")
-        rows = self.cursor.fetchall()
-        self.table_history.setRowCount(len(rows))
-        for r_idx, row in enumerate(rows):
-            for c_idx, val in enumerate(row):
-                self.table_history.setItem(r_idx, c_idx, QTableWidgetItem(str(val)))
-        self.table_history.resizeColumnsToContents()
+        # Only the newest page is read here, the view asks for older ones on scroll
+        page = self.fetch_history_page(HISTORY_NO_ID, HISTORY_PAGE_SIZE)
+        self.history_model.set_rows(page, more=len(page) == HISTORY_PAGE_SIZE)
+
+    def fetch_history_page(self, before_id, limit):
+        # Keyset paging on the primary key; one SQL text, so sqlite3 reuses the prepared statement
+        self.cursor.execute("SELECT id, date, files, duration, status FROM history WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+        return self.cursor.fetchmany(limit)
 
     def add_history_entry(self, task_info, duration, status):
         date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         files_str = f"{len(task_info['files'])} files"
         dbs_str = ", ".join(task_info['dbs'])
         
-        self.cursor.execute("INSERT INTO history (date, files, dbs, duration, status) VALUES (?, ?, ?, ?, ?)",
-                            (date_str, files_str, dbs_str, duration, status))
-        self.conn.commit()
-        self.load_history()
+        with self.conn:
+            self.cursor.execute("INSERT INTO history (date, files, dbs, duration, status) VALUES (?, ?, ?, ?, ?)",
+                                (date_str, files_str, dbs_str, duration, status))
+        # The new id comes back with the insert, no second query or reload needed
+        self.history_model.prepend((self.cursor.lastrowid, date_str, files_str, duration, status))
 
     def clear_history(self):
-        self.cursor.execute("DELETE FROM history")
-        self.conn.commit()
-        self.load_history()
+        with self.conn:
+            self.cursor.execute("DELETE FROM history")
+        self.history_model.set_rows([])
 
     # MULTITHREADED CSV LOADER & TABLE LOGIC
 
     def prompt_load_results_csv(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Open PanVita CSV Result", self.last_dir, "CSV Files (*.csv)")
+        path = self.ask_open_path("Open PanVita CSV Result", "CSV Files (*.csv)")
         if path:
-            self.last_dir = os.path.dirname(path)
             self.execute_load_csv(path)
 
     def execute_load_csv(self, path):
         self.lbl_status.setText("Status: Loading CSV data... ")
-        self.res_table.clear()
+        self.res_model.set_data([], [])
         self.csv_thread = CSVLoaderThread(path)
         self.csv_thread.finished.connect(self.on_csv_loaded)
         self.csv_thread.error.connect(lambda e: QMessageBox.critical(self, "Error Loading CSV", str(e)))
         self.csv_thread.start()
 
     def on_csv_loaded(self, headers, data):
-        self.res_table.setSortingEnabled(False)
-        self.res_table.setRowCount(len(data))
-        self.res_table.setColumnCount(len(headers))
-        self.res_table.setHorizontalHeaderLabels(headers)
-        
-        for row_idx, row in enumerate(data):
-            for col_idx, val in enumerate(row):
-                self.res_table.setItem(row_idx, col_idx, NumericItem(val))
-                
-        self.res_table.resizeColumnsToContents()
+        # A new file starts in file order; with no column selected the view's sort is a no-op
+        self.res_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.res_model.set_data(headers, data)
         self.lbl_status.setText("Status: CSV Loaded ✅")
         self.current_run_results = (headers, data)
-        self.update_row_count()
-        self.update_metrics_dash(headers, data)
-        self.res_table.setSortingEnabled(True)
-
-    def update_metrics_dash(self, headers, data):
-        t = LANGUAGES[self.lang]
-        total_hits = len(data)
-        self.lbl_m_hits.setText(f"{t['metrics_hits']}<span id='MetricVal'>{total_hits}</span>")
-        
-        # Calculate Average Identity
-        id_col = None
-        for i, h in enumerate(headers):
-            if "ident" in h.lower() or "pident" in h.lower():
-                id_col = i; break
-                
-        if id_col is not None and total_hits > 0:
-            total_id = sum(float(row[id_col]) for row in data if str(row[id_col]).replace('.','',1).isdigit())
-            avg_id = total_id / total_hits
-            self.lbl_m_id.setText(f"{t['metrics_id']}<span id='MetricVal'>{avg_id:.1f}%</span>")
-        else:
-            self.lbl_m_id.setText(f"{t['metrics_id']}<span id='MetricVal'>N/A</span>")
-            
-        # Determine Top Database
-        db_col = None
-        for i, h in enumerate(headers):
-            if "database" in h.lower() or "db" in h.lower() or "banco" in h.lower():
-                db_col = i; break
-                
-        if db_col is not None and total_hits > 0:
-            db_counts = {}
-            for row in data:
-                db_name = str(row[db_col])
-                db_counts[db_name] = db_counts.get(db_name, 0) + 1
-            top_db = max(db_counts, key=db_counts.get)
-            self.lbl_m_db.setText(f"{t['metrics_db']}<span id='MetricVal'>{top_db}</span>")
-        else:
-            self.lbl_m_db.setText(f"{t['metrics_db']}<span id='MetricVal'>N/A</span>")
+        self.filter_results_table(self.le_search_table.text())
+
+    def update_metrics_dash(self, headers, data, columns=None):
+        tpl = self.metric_templates
+        metrics = compute_metrics(headers, data, columns)
+        self.lbl_m_hits.setText(tpl["metrics_hits"].format(metrics["hits"]))
+        avg_id = metrics["avg_id"]
+        self.lbl_m_id.setText(tpl["metrics_id"].format("N/A" if avg_id is None else f"{avg_id:.1f}%"))
+        top_db = metrics["top_db"]
+        self.lbl_m_db.setText(tpl["metrics_db"].format("N/A" if top_db is None else top_db))
+
+    def apply_filter_now(self):
+        # Enter skips the typing delay
+        self.filter_timer.stop()
+        self.filter_results_table(self.le_search_table.text())
 
     def filter_results_table(self, text):
-        text_lower = text.lower()
-        for row in range(self.res_table.rowCount()):
-            match = False
-            for col in range(self.res_table.columnCount()):
-                item = self.res_table.item(row, col)
-                if item and text_lower in item.text().lower():
-                    match = True
-                    break
-            self.res_table.setRowHidden(row, not match)
+        # Resetting the model drops column widths, so they are put back after
+        header = self.res_table.horizontalHeader()
+        widths = [header.sectionSize(col) for col in range(header.count())]
+        self.res_model.set_filter(text)
+        for col, width in enumerate(widths):
+            header.resizeSection(col, width)
         self.update_row_count()
+        # Metrics follow the rows currently shown
+        if self.current_run_results:
+            self.update_metrics_dash(self.res_model.headers, self.res_model.rows, self.res_model.metric_columns)
 
     def update_row_count(self):
-        total = self.res_table.rowCount()
-        visible = sum(1 for row in range(total) if not self.res_table.isRowHidden(row))
+        total = len(self.res_model.loaded_rows)
+        visible = self.res_model.rowCount()
         self.lbl_row_count.setText(f"Rows: {visible}/{total}")
 
     def export_filtered_csv(self):
         if not self.current_run_results: return
-        path, _ = QFileDialog.getSaveFileName(self, "Export Filtered CSV", self.last_dir, "CSV Files (*.csv)")
+        path = self.ask_save_path("Export Filtered CSV", "CSV Files (*.csv);;Compressed CSV (*.csv.gz)")
         if not path: return
-        self.last_dir = os.path.dirname(path)
-        try:
-            with open(path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                headers = [self.res_table.horizontalHeaderItem(i).text() for i in range(self.res_table.columnCount())]
-                writer.writerow(headers)
-                for row in range(self.res_table.rowCount()):
-                    if not self.res_table.isRowHidden(row):
-                        row_data = [self.res_table.item(row, col).text() for col in range(self.res_table.columnCount())]
-                        writer.writerow(row_data)
-            QMessageBox.information(self, "Success", "Filtered CSV exported successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to export CSV:\n{str(e)}")
+        self.btn_export_filtered.setEnabled(False)
+        self.lbl_status.setText("Status: Exporting filtered CSV... ")
+        self.export_thread = CSVExportThread(path, list(self.res_model.headers), self.res_model.rows)
+        self.export_thread.finished.connect(self.on_csv_exported)
+        self.export_thread.error.connect(self.on_csv_export_failed)
+        self.export_thread.start()
+
+    def on_csv_exported(self, path):
+        self.btn_export_filtered.setEnabled(True)
+        self.lbl_status.setText("Status: Filtered CSV exported ✅")
+        QMessageBox.information(self, "Success", "Filtered CSV exported successfully.")
+
+    def on_csv_export_failed(self, message):
+        self.btn_export_filtered.setEnabled(True)
+        self.lbl_status.setText("Status: CSV export failed ❌")
+        QMessageBox.critical(self, "Error", f"Failed to export CSV:\n{message}")
 
     def show_table_context_menu(self, pos):
-        item = self.res_table.itemAt(pos)
-        if not item: return
+        index = self.res_table.indexAt(pos)
+        if not index.isValid(): return
+        text = index.data()
         menu = QMenu(self)
         
         view_fasta_action = QAction(" Visualizar Sequência FASTA", self)
         copy_action = QAction(" Copiar Conteúdo", self)
         search_ncbi_action = QAction(" Pesquisar no NCBI", self)
+        fit_columns_action = QAction(" Ajustar Colunas", self)
         
-        view_fasta_action.triggered.connect(lambda: self.view_fasta_sequence(item.text()))
-        copy_action.triggered.connect(lambda: QApplication.clipboard().setText(item.text()))
-        search_ncbi_action.triggered.connect(lambda: webbrowser.open(f"https://www.ncbi.nlm.nih.gov/search/all/?term={item.text()}"))
+        view_fasta_action.triggered.connect(lambda: self.view_fasta_sequence(text))
+        copy_action.triggered.connect(lambda: QApplication.clipboard().setText(text))
+        search_ncbi_action.triggered.connect(lambda: webbrowser.open(f"https://www.ncbi.nlm.nih.gov/search/all/?term={text}"))
+        fit_columns_action.triggered.connect(self.res_table.resizeColumnsToContents)
         
         menu.addAction(view_fasta_action)
         menu.addSeparator()
         menu.addAction(copy_action)
         menu.addAction(search_ncbi_action)
+        menu.addSeparator()
+        menu.addAction(fit_columns_action)
         menu.exec(self.res_table.mapToGlobal(pos))
         
     def view_fasta_sequence(self, gene_name):
@@ -1872,33 +2605,51 @@ class PanVitaApp(QMainWindow):
     # GRAPH VIEWERS
 
     def load_graph_png(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Open Graph Image", self.last_dir, "Images (*.png *.jpg *.jpeg)")
+        path = self.ask_open_path("Open Graph Image", "Images (*.png *.jpg *.jpeg)")
         if path:
-            self.last_dir = os.path.dirname(path)
-            pixmap = QPixmap(path)
+            # Reopening an unchanged image skips decoding it again. Graphs are saved at
+            # 300 dpi (~34 MB decoded), above QPixmapCache's default limit, so the last
+            # one is kept here instead
+            key = (path, os.path.getmtime(path) if os.path.exists(path) else None)
+            if self.graph_pixmap is not None and self.graph_pixmap[0] == key:
+                pixmap = self.graph_pixmap[1]
+            else:
+                pixmap = QPixmap(path)
+                if not pixmap.isNull(): self.graph_pixmap = (key, pixmap)
             if not pixmap.isNull():
-                self.lbl_graph_view.setPixmap(pixmap)
-                self.lbl_graph_view.setScaledContents(True)
-                self.lbl_graph_view.setMaximumSize(pixmap.size())
+                self.lbl_graph_view.set_source(pixmap)
             else:
                 QMessageBox.warning(self, "Error", "Failed to load image.")
 
     def load_graph_html(self):
+        global WEB_ENGINE_AVAILABLE
         if not WEB_ENGINE_AVAILABLE: return
-        path, _ = QFileDialog.getOpenFileName(self, "Open Interactive Graph", self.last_dir, "HTML Files (*.html *.htm)")
+        path = self.ask_open_path("Open Interactive Graph", "HTML Files (*.html *.htm)")
         if path:
-            self.last_dir = os.path.dirname(path)
             local_url = QUrl.fromLocalFile(os.path.abspath(path))
+            if self.web_view is None:
+                try:
+                    from PyQt6.QtWebEngineWidgets import QWebEngineView
+                except ImportError as e:
+                    # Found on disk but not loadable (missing system libraries, mismatched wheel)
+                    WEB_ENGINE_AVAILABLE = False
+                    self.btn_load_html.setEnabled(False)
+                    QMessageBox.warning(self, "Error", f"QtWebEngine could not be loaded:\n{e}")
+                    return
+                self.web_view = QWebEngineView()
+                layout = self.tab_graph_html.layout()
+                layout.replaceWidget(self.lbl_html_placeholder, self.web_view)
+                self.lbl_html_placeholder.deleteLater()
             self.web_view.load(local_url)
 
     # REPORTS EXPORT
 
     def export_log(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Save Log", self.last_dir, "Text Files (*.txt)")
+        path = self.ask_save_path("Save Log", "Text Files (*.txt);;Compressed Text (*.txt.gz)")
         if path:
-            self.last_dir = os.path.dirname(path)
             try:
-                with open(path, 'w', encoding='utf-8') as f:
+                self.flush_terminal()
+                with open_export(path) as f:
                     f.write(self.terminal.toPlainText())
                 QMessageBox.information(self, "Success", "Log exported successfully.")
             except Exception as e:
@@ -1909,53 +2660,65 @@ class PanVitaApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "Load a CSV result first to generate a report.")
             return
 
-        path, _ = QFileDialog.getSaveFileName(self, "Export PDF Report", self.last_dir, "PDF Files (*.pdf)")
+        path = self.ask_save_path("Export PDF Report", "PDF Files (*.pdf)")
         if not path: return
-        self.last_dir = os.path.dirname(path)
 
-        try:
-            writer = QPdfWriter(path)
-            writer.setPageSize(QPdfWriter.PageSize.A4)
-            writer.setResolution(300)
-            painter = QPainter(writer)
-            
-            font_title = QFont("Arial", 20, QFont.Weight.Bold)
-            font_body = QFont("Arial", 12)
-            
-            painter.setFont(font_title)
-            painter.drawText(200, 400, "PanVita 2 - Executive Analysis Report")
-            
-            painter.setFont(font_body)
-            y = 800
-            painter.drawText(200, y, f"Total records analyzed: {len(self.current_run_results[1])}")
-            y += 200
-            painter.drawText(200, y, f"Identity Threshold: {self.spn_i.value()}%  |  Coverage: {self.spn_c.value()}%")
-            y += 200
-            painter.drawText(200, y, f"Threads Used: {self.spn_threads.value()}")
-                
-            painter.end()
-            QMessageBox.information(self, "Success", "PDF Report exported successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate PDF:\n{str(e)}")
+        self.btn_export_pdf.setEnabled(False)
+        self.lbl_status.setText("Status: Exporting PDF report... ")
+        self.pdf_thread = PdfReportThread(path, len(self.current_run_results[1]), self.spn_i.value(),
+                                          self.spn_c.value(), self.spn_threads.value())
+        self.pdf_thread.finished.connect(self.on_pdf_exported)
+        self.pdf_thread.error.connect(self.on_pdf_failed)
+        self.pdf_thread.start()
+
+    def on_pdf_exported(self, path):
+        self.btn_export_pdf.setEnabled(True)
+        self.lbl_status.setText("Status: PDF Report exported ✅")
+        QMessageBox.information(self, "Success", "PDF Report exported successfully.")
+
+    def on_pdf_failed(self, message):
+        self.btn_export_pdf.setEnabled(True)
+        self.lbl_status.setText("Status: PDF export failed ❌")
+        QMessageBox.critical(self, "Error", f"Failed to generate PDF:\n{message}")
 
     # EXECUTION LOGIC (WITH JSON AND QUEUE SUPPORT)
 
     def log(self, text, is_error=False):
+        if is_error:
+            color = LOG_COLORS[0][1]
+        else:
+            color = next((c for pattern, c in LOG_COLORS if pattern.search(text)), None)
+            if color is None:
+                color = self.log_text_color
+
+        # Queued and written by flush_terminal, so bursts cause one relayout
+        self.term_buffer.append((color, text))
+        if not self.term_timer.isActive():
+            self.term_timer.start()
+
+    def flush_terminal(self):
+        self.term_timer.stop()
+        if not self.term_buffer: return
+        cursor = QTextCursor(self.terminal.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        run_color, run_text = None, []
+        for color, text in self.term_buffer + [(None, "")]:
+            if color != run_color and run_text:
+                fmt = QTextCharFormat()
+                fmt.setForeground(QColor(run_color))
+                cursor.insertText("".join(run_text), fmt)
+                run_text = []
+            run_color = color
+            run_text.append(text)
+        cursor.endEditBlock()
+        self.term_buffer.clear()
         self.terminal.moveCursor(QTextCursor.MoveOperation.End)
-        color = QColor(self.central_widget.palette().text().color())
-        lower_text = text.lower()
-        if is_error or "error" in lower_text or "exception" in lower_text or "failed" in lower_text:
-            color = QColor("#ff5555")
-        elif "success" in lower_text or "completed" in lower_text or "done" in lower_text:
-            color = QColor("#50fa7b")
-        elif "warning" in lower_text:
-            color = QColor("#f1fa8c")
-        elif "aborted" in lower_text:
-            color = QColor("#ff5555")
-            
-        self.terminal.setTextColor(color)
-        self.terminal.insertPlainText(text)
-        self.terminal.moveCursor(QTextCursor.MoveOperation.End)
+
+    def clear_terminal(self):
+        self.term_timer.stop()
+        self.term_buffer.clear()
+        self.terminal.clear()
 
     def build_args(self):
         core_path = self.settings.value("path_panvita", "panvita.py", type=str)
@@ -1974,9 +2737,10 @@ class PanVitaApp(QMainWindow):
             if cb.isChecked(): args.append(flag)
         if self.cb_custom.isChecked() and self.custom_db_path: args.extend(["-custom", self.custom_db_path])
         
-        if self.rb_diamond.isChecked(): args.append("-diamond")
-        elif self.rb_blast.isChecked(): args.append("-blast")
-        elif self.rb_both.isChecked(): args.append("-both")
+        for flag, rb in self.aligner_rbs.items():
+            if rb.isChecked():
+                args.append(flag)
+                break
         if self.cb_force_d.isChecked(): args.append("-d")
 
         args.extend(["-i", str(self.spn_i.value())])
@@ -2019,8 +2783,8 @@ class PanVitaApp(QMainWindow):
             self.tray_icon.showMessage("PanVita Queue", "All tasks completed.", QSystemTrayIcon.MessageIcon.Information, 5000)
             return
             
-        task = self.task_queue.pop(0)
-        self.list_queue.takeItem(0)
+        task = self.task_queue.popleft()
+        self.queue_model.removeRows(0, 1)
         
         # Save info for history
         self.current_task_info = task
@@ -2063,16 +2827,18 @@ class PanVitaApp(QMainWindow):
         self.execute_script(args)
 
     def execute_script(self, args):
-        self.terminal.clear()
+        self.clear_terminal()
         self.log(f"$ python {' '.join(args)}\n{'='*70}\n\n")
         
-        t = LANGUAGES[self.lang]
-        self.btn_run_master.setText(t["btn_stop"])
+        self.btn_run_master.setText(self.strings["btn_stop"])
         self.btn_run_master.setStyleSheet("background-color: #ff5555; color: #ffffff;")
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(5)
 
         self.process = QProcess(self)
+        # handle_stdout reads lines from the current channel, stderr is read separately
+        self.process.setReadChannel(QProcess.ProcessChannel.StandardOutput)
+        self.stderr_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
         self.process.readyReadStandardOutput.connect(self.handle_stdout)
         self.process.readyReadStandardError.connect(self.handle_stderr)
         self.process.finished.connect(self.process_finished)
@@ -2096,49 +2862,70 @@ class PanVitaApp(QMainWindow):
         self.process.start("python", args)
 
     def reset_run_button(self):
-        t = LANGUAGES[self.lang]
-        self.btn_run_master.setText(t["btn_run"])
+        self.btn_run_master.setText(self.strings["btn_run"])
         self.btn_run_master.setStyleSheet("")
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(100)
 
-    def handle_stdout(self):
-        data = self.process.readAllStandardOutput()
-        text = bytes(data).decode("utf8", errors="replace").strip()
-        
-        for line in text.split('\n'):
-            if not line: continue
-            
-            # Attempt to parse as JSON (Structured Communication)
+    def handle_stdout(self, final=False):
+        # Only complete lines are taken, a line split across reads waits in Qt's buffer
+        lines = []
+        while self.process.canReadLine():
+            lines.append(self.process.readLine())
+        if final:
+            # A last line without a trailing newline is still in the buffer
+            tail = self.process.readAllStandardOutput()
+            if tail: lines.append(tail)
+        # Status and progress are tracked across the burst and set once at the end
+        progress = self.progress_bar.value()
+        status = None
+        for data in lines:
+            progress, status = self.handle_stdout_line(data, progress, status)
+        if progress != self.progress_bar.value(): self.progress_bar.setValue(progress)
+        if status is not None: self.lbl_status.setText(status)
+
+    def handle_stdout_line(self, data, progress, status):
+        """Log one output line and return the progress and status it leaves"""
+        raw = bytes(data).rstrip(b"\r\n")
+        if not raw.strip(): return progress, status
+
+        # Attempt to parse as JSON (Structured Communication), plain text lines skip the parser
+        # and so do brace-led lines that cannot be a complete object. Both loaders take the
+        # raw bytes, so structured lines are never decoded to str first
+        msg = None
+        if raw.startswith(b'{') and raw.rstrip().endswith(b'}'):
             try:
-                msg = json.loads(line)
-                if 'progresso' in msg:
-                    self.progress_bar.setValue(msg['progresso'])
-                if 'etapa' in msg:
-                    self.lbl_status.setText(f"Status: {msg['etapa']}...")
-                if 'log' in msg:
-                    self.log(msg['log'] + "\n")
-            except json.JSONDecodeError:
-                # Normal Text Fallback
-                self.log(line + "\n")
-                low_txt = line.lower()
-                if "aligning" in low_txt or "running diamond" in low_txt or "running blast" in low_txt:
-                    self.lbl_status.setText("Status: Aligning sequences... ")
-                    if self.progress_bar.value() < 30: self.progress_bar.setValue(30)
-                elif "downloading" in low_txt or "ncbi" in low_txt:
-                    self.lbl_status.setText("Status: Downloading from NCBI... ")
-                    if self.progress_bar.value() < 60: self.progress_bar.setValue(60)
-                elif "plotting" in low_txt or "generating graph" in low_txt:
-                    self.lbl_status.setText("Status: Generating output graphs... ")
-                    if self.progress_bar.value() < 90: self.progress_bar.setValue(90)
+                msg = json_loads(raw)
+            except ValueError:
+                msg = None
+        if isinstance(msg, dict):
+            if 'progresso' in msg:
+                progress = msg['progresso']
+            if 'etapa' in msg:
+                status = f"Status: {msg['etapa']}..."
+            if 'log' in msg:
+                self.log(msg['log'] + "\n")
+        else:
+            # Normal Text Fallback
+            line = raw.decode("utf8", errors="replace")
+            self.log(line + "\n")
+            if not STATUS_KEYWORDS.search(line): return progress, status
+            for pattern, stage_status, stage_progress in STATUS_STAGES:
+                if pattern.search(line):
+                    status = stage_status
+                    if progress < stage_progress: progress = stage_progress
+                    break
+        return progress, status
 
     def handle_stderr(self):
-        data = self.process.readAllStandardError()
-        text = bytes(data).decode("utf8", errors="replace")
+        # The decoder keeps a multi-byte character cut between reads for the next one
+        text = self.stderr_decoder.decode(bytes(self.process.readAllStandardError()))
+        if not text: return
         self.log(text, is_error=True)
         self.lbl_status.setText("Status: Running with warnings/errors ⚠️")
 
     def process_finished(self, exit_code, exit_status):
+        self.handle_stdout(final=True)
         self.reset_run_button()
         
         end_time = datetime.now()
@@ -2173,6 +2960,8 @@ class PanVitaApp(QMainWindow):
             self.tray_icon.showMessage("PanVita 2", "Analysis finished with errors or was aborted.", QSystemTrayIcon.MessageIcon.Warning, 5000)
 
 if __name__ == "__main__":
+    # Lets QtWebEngine be imported after the application exists
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setFont(QFont("Segoe UI", 10))
     window = PanVitaApp()
@@ -2,11 +2,100 @@
 # Description: Database management (download and indexing)
 
 import os
+import sys
 import shutil
 import zipfile
 import re
+import concurrent.futures
 from config import PanViTaConfig
-from utils import FileHandler
+from utils import FileHandler, CURL
+
+# Remote files behind each database
+DATABASE_URLS = {
+    "bacmet_fasta": "http://bacmet.biomedicine.gu.se/download/BacMet2_EXP_database.fasta",
+    "bacmet_mapping": "http://bacmet.biomedicine.gu.se/download/BacMet2_EXP.753.mapping.txt",
+    "vfdb": "http://www.mgc.ac.cn/VFs/Down/VFDB_setA_pro.fas.gz",
+    "card": "https://card.mcmaster.ca/latest/data",
+    "latlon": "https://raw.githubusercontent.com/dlnrodrigues/panvita/dlnrodrigues-Supplementary/latlon.csv",
+    "megares": "https://www.meglab.org/downloads/megares_v3.00/megares_database_v3.00.fasta",
+    "megares_zip": "https://www.meglab.org/downloads/megares_v3.00.zip",
+    "resfinder": "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Resistance/Resfinder/ForScripts/resfinder.fasta",
+    "argannot": "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Resistance/ARG-ANNOT/ARG-ANNOT_AA_V6_July2019.fasta",
+    "victors_protein": "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Virulance/Victors/victorsprotein.fasta",
+    "victors_gene": "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Virulance/Victors/victorsgene.fasta",
+}
+
+# Files kept from archives that are only partially needed (archive name -> database name)
+ARCHIVE_MEMBERS = {
+    DATABASE_URLS["card"]: {
+        "protein_fasta_protein_homolog_model.fasta": "card_protein_homolog_model.fasta",
+        "aro_index.tsv": "aro_index.tsv",
+    },
+}
+
+# Pinned SHA-256 of database files (name -> digest). Files served as "latest"
+# releases change over time, so only fixed versions should be listed here
+DATABASE_SHA256 = {}
+
+# Every database PanViTa provides, checked in this order. Each entry lists the
+# files to download (DATABASE_URLS key, local name) and the indexes built from
+# them as (FASTA, index name, BLAST dbtype, build DIAMOND index, label).
+# "fix_headers" repairs split FASTA headers before indexing and "fallback"
+# names a DatabaseManager method tried when the download fails, resolved to
+# the method itself below the class.
+DATABASES = [
+    {
+        "label": "BacMet",
+        # We use the Experimentally Confirmed (EXP) database for better accuracy
+        "files": [("bacmet_fasta", "bacmet_2.fasta"), ("bacmet_mapping", "bacmet_2.txt")],
+        "indexes": [("bacmet_2.fasta", "bacmet_2", "prot", True, "BacMet")],
+    },
+    {
+        "label": "VFDB",
+        "files": [("vfdb", "vfdb_core.fasta")],
+        "indexes": [("vfdb_core.fasta", "vfdb_core", "prot", True, "VFDB")],
+    },
+    {
+        "label": "CARD",
+        # Only the files in ARCHIVE_MEMBERS are extracted from the archive
+        "files": [("card", "card_protein_homolog_model.fasta")],
+        "indexes": [("card_protein_homolog_model.fasta", "card_protein_homolog_model", "prot", True, "CARD")],
+    },
+    {
+        "label": "coordinates keys",
+        "files": [("latlon", "latlon.csv")],
+        "indexes": [],
+    },
+    {
+        "label": "MEGARes v3.00",
+        "files": [("megares", "megares_v3.fasta")],
+        "indexes": [("megares_v3.fasta", "megares_v3", "nucl", False, "MEGARes")],
+        "fallback": "_download_megares_zip",
+    },
+    {
+        "label": "ResFinder",
+        "files": [("resfinder", "resfinder.fasta")],
+        "indexes": [("resfinder.fasta", "resfinder", "nucl", False, "ResFinder")],
+    },
+    {
+        "label": "ARG-ANNOT",
+        "files": [("argannot", "argannot.fasta")],
+        "indexes": [("argannot.fasta", "argannot", "prot", True, "ARG-ANNOT")],
+    },
+    {
+        "label": "Victors",
+        "files": [("victors_protein", "victorsprotein.fasta"), ("victors_gene", "victorsgene.fasta")],
+        "indexes": [("victorsprotein.fasta", "victors", "prot", True, "Victors"),
+                    ("victorsgene.fasta", "victors_nucl", "nucl", False, "Victors")],
+        "fix_headers": True,
+    },
+]
+
+# Index name built from each FASTA file
+INDEX_NAMES = {index[0]: index[1] for database in DATABASES for index in database["indexes"]}
+
+# Maximum number of database files downloaded at the same time
+MAX_PARALLEL_DOWNLOADS = 8
 
 class DatabaseManager:
     def __init__(self, dppath):
@@ -14,6 +103,11 @@ class DatabaseManager:
         self.config_file = os.path.join(self.home, ".panvita.db.paths")
         self.dppath = dppath
         self.dbpath = self._get_database_path()
+        self.makeblastdb_exe = os.path.join(
+            dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
+        self._pending_downloads = {}
+        # Re-check every downloaded database against its source
+        self.update = ("-update" in sys.argv) or ("-u" in sys.argv)
 
     def _get_database_path(self):
         """Get or create the database path"""
@@ -26,9 +120,7 @@ class DatabaseManager:
                 file.write(dbpath)
         
         # Ensure the directory exists
-        parent_dir = os.path.dirname(dbpath.rstrip("/"))
-        if "DB" not in os.listdir(parent_dir):
-            os.makedirs(dbpath, exist_ok=True)
+        os.makedirs(dbpath, exist_ok=True)
             
         return dbpath
 
@@ -66,330 +158,269 @@ class DatabaseManager:
                 outfile.write(header + "\n")
                 outfile.write("\n".join(sequence) + "\n")
 
+        # The recorded digest describes the local file, so it follows the rewrite
+        meta_file = filepath + ".meta"
+        if os.path.exists(meta_file):
+            FileHandler.record_digest(meta_file, FileHandler.file_sha256(filepath))
+
     def check_databases(self, diamond_exe, custom_db_path=None):
         """Check and download all required databases"""
         print("\nChecking your databases...")
         
-        # BacMet database
-        self._check_bacmet(diamond_exe)
-        
-        # VFDB database
-        self._check_vfdb(diamond_exe)
-        
-        # CARD database
-        self._check_card(diamond_exe)
-        
-        # Coordinates file
-        self._check_latlon()
+        # Start every missing download at once; the checks below wait on them
+        self._prefetch_downloads()
+        try:
+            if self.update:
+                # Refreshed files drop their stale indexes, so let them land before indexing
+                concurrent.futures.wait(list(self._pending_downloads.values()))
+            self._check_all(diamond_exe, custom_db_path)
+        finally:
+            self._pending_downloads = {}
         
-        # MEGARes database
-        self._check_megares(diamond_exe)
+        return self.dbpath
 
-        # ResFinder database
-        self._check_resfinder(diamond_exe)
-        
-        # ARG-ANNOT database
-        self._check_argannot(diamond_exe)
-        
-        # Victors database
-        self._check_victors(diamond_exe)
+    def _check_all(self, diamond_exe, custom_db_path):
+        """Run the check of every database in order"""
+        for database in DATABASES:
+            self._check_database(database, diamond_exe)
         
         # Custom database
         if custom_db_path:
             self._check_custom(diamond_exe, custom_db_path)
-        
-        return self.dbpath
 
-    def _check_bacmet(self, diamond_exe):
-        """Check and download BacMet database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        # Check for both the FASTA and the MAPPING file
-        if ("bacmet_2.fasta" not in os.listdir(self.dbpath)) or ("bacmet_2.txt" not in os.listdir(self.dbpath)):
-            print("\nDownloading BacMet database...")
-            # We use the Experimentally Confirmed (EXP) database for better accuracy
-            bacmet = FileHandler.safe_download(
-                "http://bacmet.biomedicine.gu.se/download/BacMet2_EXP_database.fasta")
-            os.rename(bacmet, os.path.join(self.dbpath, "bacmet_2.fasta"))
-            print("")
-            
-            # Create DIAMOND index
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'bacmet_2.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'bacmet_2')} --quiet")
-            
-            print("\nDownloading BacMet annotation file...")
-            # Downloading the corresponding mapping file
-            bacmet_an = FileHandler.safe_download(
-                "http://bacmet.biomedicine.gu.se/download/BacMet2_EXP.753.mapping.txt")
-            os.rename(bacmet_an, os.path.join(self.dbpath, "bacmet_2.txt"))
-
-        # Check if BacMet DIAMOND index exists
-        if ("bacmet_2.fasta" in os.listdir(self.dbpath) and 
-            "bacmet_2.dmnd" not in os.listdir(self.dbpath)):
-            print("\nCreating BacMet DIAMOND index...")
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'bacmet_2.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'bacmet_2')} --quiet")
-
-        # Check if BacMet BLAST index exists
-        if ("bacmet_2.fasta" in os.listdir(self.dbpath) and 
-            not any(f.startswith("bacmet_2.p") for f in os.listdir(self.dbpath))):
-            print("\nCreating BacMet BLAST index...")
-            os.system(
-                f"{makeblastdb_exe} -in {os.path.join(self.dbpath, 'bacmet_2.fasta')} "
-                f"-dbtype prot -out {os.path.join(self.dbpath, 'bacmet_2')}")
-
-    def _check_vfdb(self, diamond_exe):
-        """Check and download VFDB database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        if "vfdb_core.fasta" not in os.listdir(self.dbpath):
-            print("\nDownloading VFDB database...")
-            vfdb = FileHandler.safe_download("http://www.mgc.ac.cn/VFs/Down/VFDB_setA_pro.fas.gz")
-
-            # Remove existing file if it exists
-            if os.path.exists("vfdb_core.fasta.gz"):
-                os.remove("vfdb_core.fasta.gz")
-
-            os.rename(vfdb, "vfdb_core.fasta.gz")
-            FileHandler.extract_gz_file("vfdb_core.fasta.gz", "vfdb_core.fasta")
-            os.rename("vfdb_core.fasta", os.path.join(self.dbpath, "vfdb_core.fasta"))
-
-            # Remove temporary .gz file after extraction
-            if os.path.exists("vfdb_core.fasta.gz"):
-                os.remove("vfdb_core.fasta.gz")
-
-            print("")
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'vfdb_core.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'vfdb_core')} --quiet")
-
-        # Check if VFDB DIAMOND index exists
-        if ("vfdb_core.fasta" in os.listdir(self.dbpath) and 
-            "vfdb_core.dmnd" not in os.listdir(self.dbpath)):
-            print("\nCreating VFDB DIAMOND index...")
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'vfdb_core.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'vfdb_core')} --quiet")
-
-        # Check if VFDB BLAST index exists
-        if ("vfdb_core.fasta" in os.listdir(self.dbpath) and 
-            not any(f.startswith("vfdb_core.p") for f in os.listdir(self.dbpath))):
-            print("\nCreating VFDB BLAST index...")
-            os.system(
-                f"{makeblastdb_exe} -in {os.path.join(self.dbpath, 'vfdb_core.fasta')} "
-                f"-dbtype prot -out {os.path.join(self.dbpath, 'vfdb_core')}")
-
-    def _check_card(self, diamond_exe):
-        """Check and download CARD database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        if "card_protein_homolog_model.fasta" not in os.listdir(self.dbpath):
-            current_files = os.listdir()
-            print("\nDownloading CARD database...")
-            card = FileHandler.safe_download("https://card.mcmaster.ca/latest/data")
-            FileHandler.extract_tar_file(card)
-            os.rename("protein_fasta_protein_homolog_model.fasta",
-                      os.path.join(self.dbpath, "card_protein_homolog_model.fasta"))
-            os.rename("aro_index.tsv", os.path.join(self.dbpath, "aro_index.tsv"))
-            FileHandler.clean_up_files(current_files)
-            print("")
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'card_protein_homolog_model.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'card_protein_homolog_model')} --quiet")
-
-        # Check if CARD DIAMOND index exists
-        if ("card_protein_homolog_model.fasta" in os.listdir(self.dbpath) and 
-            "card_protein_homolog_model.dmnd" not in os.listdir(self.dbpath)):
-            print("\nCreating CARD DIAMOND index...")
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'card_protein_homolog_model.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'card_protein_homolog_model')} --quiet")
-
-        # Check if CARD BLAST index exists
-        if ("card_protein_homolog_model.fasta" in os.listdir(self.dbpath) and 
-            not any(f.startswith("card_protein_homolog_model.p") for f in os.listdir(self.dbpath))):
-            print("\nCreating CARD BLAST index...")
-            os.system(
-                f"{makeblastdb_exe} -in {os.path.join(self.dbpath, 'card_protein_homolog_model.fasta')} "
-                f"-dbtype prot -out {os.path.join(self.dbpath, 'card_protein_homolog_model')}")
-
-    def _check_latlon(self):
-        """Check and download coordinates file if needed"""
-        if "latlon.csv" not in os.listdir(self.dbpath):
-            print("\nDownloading coordinates keys file...")
-            latlon = FileHandler.safe_download(
-                "https://raw.githubusercontent.com/dlnrodrigues/panvita/dlnrodrigues-Supplementary/latlon.csv")
-            os.rename(latlon, os.path.join(self.dbpath, "latlon.csv"))
-            print("")
-
-    def _check_megares(self, diamond_exe):
-        """Check and download MEGARes database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        if "megares_v3.fasta" not in os.listdir(self.dbpath):
-            print("\nDownloading MEGARes v3.00 database...")
-            current_files = os.listdir()
-            
-            # Try to download the main database file directly first
+    def _missing_downloads(self):
+        """List (url, name) pairs of database files not present in the database folder.
+
+        When updating, every file is listed and checked against its source.
+        """
+        files = [] if self.update else os.listdir(self.dbpath)
+        downloads = []
+        for database in DATABASES:
+            # Databases made of several files are downloaded together
+            if any(name not in files for _, name in database["files"]):
+                downloads += [(DATABASE_URLS[key], name) for key, name in database["files"]]
+        return downloads
+
+    def _prefetch_downloads(self):
+        """Download all missing database files concurrently in the background"""
+        downloads = self._missing_downloads()
+        if not downloads:
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(MAX_PARALLEL_DOWNLOADS, len(downloads)))
+
+        # Plain files go through one parallel curl run instead of a process each
+        batch = [(url, name) for url, name in downloads
+                 if CURL and url not in ARCHIVE_MEMBERS and not url.endswith(".gz")]
+        if len(batch) > 1:
+            futures = {url: concurrent.futures.Future() for url, _ in batch}
+            self._pending_downloads.update(futures)
+            executor.submit(self._fetch_batch, batch, futures)
+            downloads = [(url, name) for url, name in downloads if url not in futures]
+
+        for url, name in downloads:
+            self._pending_downloads[url] = executor.submit(self._fetch, url, name, True)
+        executor.shutdown(wait=False)
+
+    def _fetch_batch(self, batch, futures):
+        """Download (url, name) pairs with a single curl run and resolve their futures.
+
+        Files curl could not get are retried one by one with _fetch.
+        """
+        existed = {name: os.path.exists(os.path.join(self.dbpath, name)) for _, name in batch}
+        for name, found in existed.items():
+            if not found:
+                self._drop_stale_meta(os.path.join(self.dbpath, name + ".meta"))
+        jobs = [(url, os.path.join(self.dbpath, name + ".part"), os.path.join(self.dbpath, name + ".meta"))
+                for url, name in batch]
+        try:
+            results = FileHandler.curl_batch(jobs, MAX_PARALLEL_DOWNLOADS)
+        except Exception as e:
+            print(f"Batch download failed: {e}")
+            results = {}
+
+        for url, name in batch:
+            future = futures[url]
             try:
-                print("Attempting direct download of main database file...")
-                megares_file = FileHandler.safe_download("https://www.meglab.org/downloads/megares_v3.00/megares_database_v3.00.fasta")
-                os.rename(megares_file, os.path.join(self.dbpath, "megares_v3.fasta"))
-                print("Direct download successful!")
-                
-            except Exception as e:
-                print(f"Direct download failed: {e}")
-                print("Trying ZIP download...")
-                
-                megares_zip = FileHandler.safe_download("https://www.meglab.org/downloads/megares_v3.00.zip")
-                
-                # Extract the zip file
-                with zipfile.ZipFile(megares_zip, 'r') as zip_ref:
-                    zip_ref.extractall('.')
-                
-                # Find the main database file
-                megares_main_file = None
-                for item in os.listdir('.'):
-                    if item.endswith('.fasta'):
-                        if 'database' in item.lower() or 'megares_v3' in item.lower():
-                            megares_main_file = item
-                            break
-                
-                # If no main database file found, use the first .fasta file
-                if megares_main_file is None:
-                    for item in os.listdir('.'):
-                        if item.endswith('.fasta'):
-                            megares_main_file = item
-                            break
-                
-                if megares_main_file:
-                    os.rename(megares_main_file, os.path.join(self.dbpath, "megares_v3.fasta"))
-                    print(f"Using MEGARes file: {megares_main_file}")
+                status = results.get(url)
+                if status is None:
+                    future.set_result(self._fetch(url, name, True))
                 else:
-                    print("Warning: No .fasta file found in MEGARes archive!")
-                    return  # Skip MEGARes setup if no file found
-                
-                FileHandler.clean_up_files(current_files)
-            
-            print("")
-            # Create DIAMOND index
-            os.system(
-                f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'megares_v3.fasta')} "
-                f"-d {os.path.join(self.dbpath, 'megares_v3')} --quiet")
-
-        # Check if MEGARes BLAST index exists
-        if ("megares_v3.fasta" in os.listdir(self.dbpath) and 
-            not any(f.startswith("megares_v3.n") for f in os.listdir(self.dbpath))):
-            print("\nCreating MEGARes BLAST index (nucleotide)...")
-            os.system(
-                f"{makeblastdb_exe} -in {os.path.join(self.dbpath, 'megares_v3.fasta')} "
-                f"-dbtype nucl -out {os.path.join(self.dbpath, 'megares_v3')}")
-
-    def _check_resfinder(self, diamond_exe):
-        """Check and download ResFinder database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        if "resfinder.fasta" not in os.listdir(self.dbpath):
-            print("\nDownloading ResFinder database...")
-            url = "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Resistance/Resfinder/ForScripts/resfinder.fasta"
-            try:
-                resfinder = FileHandler.safe_download(url)
-                os.rename(resfinder, os.path.join(self.dbpath, "resfinder.fasta"))
-                print("ResFinder download complete.")
-                
+                    future.set_result(self._install(name, status, existed[name]))
             except Exception as e:
-                print(f"Error downloading ResFinder: {e}")
-
-        if ("resfinder.fasta" in os.listdir(self.dbpath) and 
-            not any(f.startswith("resfinder.n") for f in os.listdir(self.dbpath))):
-            print("\nCreating ResFinder BLAST index (Nucleotide)...")
-            os.system(
-                f"{makeblastdb_exe} -in {os.path.join(self.dbpath, 'resfinder.fasta')} "
-                f"-dbtype nucl -out {os.path.join(self.dbpath, 'resfinder')}")
-
-    def _check_argannot(self, diamond_exe):
-        """Check and download ARG-ANNOT database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        if "argannot.fasta" not in os.listdir(self.dbpath):
-            print("\nDownloading ARG-ANNOT database...")
-            url = "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Resistance/ARG-ANNOT/ARG-ANNOT_AA_V6_July2019.fasta"
+                future.set_exception(e)
+
+    def _fetch(self, url, name, quiet=False):
+        """Download url straight into the database folder as name.
+
+        .gz files are decompressed and archives in ARCHIVE_MEMBERS extracted
+        on the fly. Data is written to a .part file renamed once complete, so
+        an interrupted download is never mistaken for a finished database.
+        The ETag/Last-Modified of each download is kept in a .meta file, so
+        updating a database that did not change costs a single request.
+        """
+        if url in ARCHIVE_MEMBERS:
+            names = list(ARCHIVE_MEMBERS[url].values())
+            meta_file = os.path.join(self.dbpath, names[0] + ".meta")
+            if os.path.exists(os.path.join(self.dbpath, names[0])):
+                try:
+                    if FileHandler.download_tar_members(
+                            url, ARCHIVE_MEMBERS[url], self.dbpath, quiet=quiet, meta_file=meta_file) is not None:
+                        for member in names:
+                            self._remove_indexes(member)
+                except Exception as e:
+                    print(f"Could not update {', '.join(names)}, keeping the current files: {e}")
+                return self.dbpath
+            self._drop_stale_meta(meta_file)
+            FileHandler.download_tar_members(url, ARCHIVE_MEMBERS[url], self.dbpath, quiet=quiet, meta_file=meta_file)
+            return self.dbpath
+
+        dest = os.path.join(self.dbpath, name)
+        part = dest + ".part"
+        meta_file = dest + ".meta"
+        exists = os.path.exists(dest)
+        if not exists:
+            self._drop_stale_meta(meta_file)
+        try:
+            if url.endswith(".gz"):
+                result = FileHandler.download_gz(url, part, quiet=quiet, meta_file=meta_file)
+            else:
+                result = FileHandler.safe_download(url, part, quiet=quiet, meta_file=meta_file)
+            self._install(name, result is not None, exists)
+        except Exception as e:
+            if not exists:
+                raise
+            print(f"Could not update {name}, keeping the current file: {e}")
+        finally:
+            if os.path.exists(part):
+                os.remove(part)
+        return dest
+
+    def _drop_stale_meta(self, meta_file):
+        """Forget the validators of a file that is gone, so it is not answered with 304"""
+        if os.path.exists(meta_file):
+            os.remove(meta_file)
+
+    def _install(self, name, updated, existed):
+        """Move a finished name.part download in place, dropping indexes built from the old file.
+
+        The SHA-256 of the new file is checked against DATABASE_SHA256 when
+        pinned and recorded in its .meta file.
+        """
+        dest = os.path.join(self.dbpath, name)
+        if updated:
+            part = dest + ".part"
+            digest = FileHandler.file_sha256(part)
+            expected = DATABASE_SHA256.get(name)
+            if expected and digest != expected:
+                os.remove(part)
+                raise Exception(f"Checksum mismatch for {name}: expected {expected}, got {digest}")
+            os.replace(part, dest)
+            FileHandler.record_digest(dest + ".meta", digest)
+            if existed:
+                self._remove_indexes(name)
+        return dest
+
+    def _remove_indexes(self, name):
+        """Delete the BLAST/DIAMOND indexes built from name so the checks rebuild them"""
+        stem = INDEX_NAMES.get(name, os.path.splitext(name)[0])
+        for f in os.listdir(self.dbpath):
+            base, ext = os.path.splitext(f)
+            if base == stem and (ext == ".dmnd" or ext[1:2] in ("p", "n")):
+                os.remove(os.path.join(self.dbpath, f))
+
+    def _download(self, url, name=None):
+        """Wait for the prefetched download of url, downloading it now if it was not prefetched"""
+        future = self._pending_downloads.pop(url, None)
+        if future is None:
+            return self._fetch(url, name)
+        return future.result()
+
+    def _check_database(self, database, diamond_exe):
+        """Download a database from DATABASES if needed and build its missing indexes"""
+        label = database["label"]
+        files = os.listdir(self.dbpath)
+        if any(name not in files for _, name in database["files"]):
+            print(f"\nDownloading {label} database...")
             try:
-                argannot = FileHandler.safe_download(url)
-                os.rename(argannot, os.path.join(self.dbpath, "argannot.fasta"))
-                print("ARG-ANNOT download complete.")
-                
-                print("Creating ARG-ANNOT DIAMOND index...")
-                os.system(
-                    f"{diamond_exe} makedb --in {os.path.join(self.dbpath, 'argannot.fasta')} "
-                    f"-d {os.path.join(self.dbpath, 'argannot')} --quiet")
+                for key, name in database["files"]:
+                    self._download(DATABASE_URLS[key], name)
+                print(f"{label} download complete.")
             except Exception as e:
-                print(f"Error downloading ARG-ANNOT: {e}")
-
-        # BLAST Index check
-        if ("argannot.fasta" in os.listdir(self.dbpath) and 
-            not any(f.startswith("argannot.p") for f in os.listdir(self.dbpath))):
-            print("\nCreating ARG-ANNOT BLAST index...")
-            os.system(
-                f"{makeblastdb_exe} -in {os.path.join(self.dbpath, 'argannot.fasta')} "
-                f"-dbtype prot -out {os.path.join(self.dbpath, 'argannot')}")
-
-    def _check_victors(self, diamond_exe):
-        """Check and download Victors database if needed"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
-        prot_path = os.path.join(self.dbpath, "victorsprotein.fasta")
-        gene_path = os.path.join(self.dbpath, "victorsgene.fasta")
-        
-        # Download both files se eles não existirem
-        if not os.path.exists(prot_path) or not os.path.exists(gene_path):
-            print("\nDownloading Victors database...")
-            url_protein = "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Virulance/Victors/victorsprotein.fasta"
-            url_gene = "https://raw.githubusercontent.com/VictorCaricatte/DataBase-for-Bioinformatics/main/Database/Prokaryotes/Virulance/Victors/victorsgene.fasta"
+                print(f"Error downloading {label}: {e}")
+                if "fallback" in database:
+                    database["fallback"](self)
+            files = os.listdir(self.dbpath)
+
+        for fasta, index, dbtype, diamond, index_label in database["indexes"]:
+            if fasta not in files:
+                continue
+            fasta_path = os.path.join(self.dbpath, fasta)
+            need_diamond = diamond and f"{index}.dmnd" not in files
+            need_blast = not any(f.startswith(f"{index}.{dbtype[0]}") for f in files)
+
+            # Both indexes read the same file, so it is fixed only once
+            if database.get("fix_headers") and (need_diamond or need_blast):
+                self._fix_fasta_headers(fasta_path)
+            if need_diamond:
+                print(f"\nCreating {index_label} DIAMOND index...")
+                self._make_diamond_index(diamond_exe, fasta_path, index)
+            if need_blast:
+                kind = "" if dbtype == "prot" else " (nucleotide)"
+                print(f"\nCreating {index_label} BLAST index{kind}...")
+                self._make_blast_index(fasta_path, index, dbtype)
+
+    def _make_diamond_index(self, diamond_exe, fasta_path, index):
+        """Build the DIAMOND database index from fasta_path"""
+        os.system(
+            f"{diamond_exe} makedb --in {fasta_path} "
+            f"-d {os.path.join(self.dbpath, index)} --quiet")
+
+    def _make_blast_index(self, fasta_path, index, dbtype):
+        """Build the BLAST database index (dbtype prot or nucl) from fasta_path"""
+        os.system(
+            f"{self.makeblastdb_exe} -in {fasta_path} "
+            f"-dbtype {dbtype} -out {os.path.join(self.dbpath, index)}")
+
+    def _download_megares_zip(self):
+        """Fallback for MEGARes: take the database FASTA from the release ZIP"""
+        print("Trying ZIP download...")
+        current_files = os.listdir()
+        try:
+            megares_zip = FileHandler.safe_download(DATABASE_URLS["megares_zip"])
             
-            try:
-                prot = FileHandler.safe_download(url_protein)
-                os.rename(prot, prot_path)
+            # Extract the zip file
+            with zipfile.ZipFile(megares_zip, 'r') as zip_ref:
+                zip_ref.extractall('.')
+            
+            # Find the main database file, else use the first .fasta file
+            megares_main_file = None
+            first_fasta = None
+            with os.scandir('.') as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.fasta'):
+                        continue
+                    if 'database' in entry.name.lower() or 'megares_v3' in entry.name.lower():
+                        megares_main_file = entry.name
+                        break
+                    if first_fasta is None:
+                        first_fasta = entry.name
+            if megares_main_file is None:
+                megares_main_file = first_fasta
                 
-                gene = FileHandler.safe_download(url_gene)
-                os.rename(gene, gene_path)
-                print("Victors download complete.")
-                    
-            except Exception as e:
-                print(f"Error downloading Victors: {e}")
-
-        # SEMPRE verifica e concerta o arquivo antes de criar qualquer index
-        
-        # DIAMOND Index check (Protein)
-        if (os.path.exists(prot_path) and "victors.dmnd" not in os.listdir(self.dbpath)):
-            self._fix_fasta_headers(prot_path)
-            print("Creating Victors DIAMOND index (Protein)...")
-            os.system(
-                f"{diamond_exe} makedb --in {prot_path} "
-                f"-d {os.path.join(self.dbpath, 'victors')} --quiet")
-
-        # BLAST Index check (Protein)
-        if (os.path.exists(prot_path) and not any(f.startswith("victors.p") for f in os.listdir(self.dbpath))):
-            self._fix_fasta_headers(prot_path)
-            print("\nCreating Victors BLAST index (Protein)...")
-            os.system(
-                f"{makeblastdb_exe} -in {prot_path} "
-                f"-dbtype prot -out {os.path.join(self.dbpath, 'victors')}")
-
-        # BLAST Index check (Nucleotide)
-        if (os.path.exists(gene_path) and not any(f.startswith("victors_nucl.n") for f in os.listdir(self.dbpath))):
-            self._fix_fasta_headers(gene_path)
-            print("\nCreating Victors BLAST index (Nucleotide)...")
-            os.system(
-                f"{makeblastdb_exe} -in {gene_path} "
-                f"-dbtype nucl -out {os.path.join(self.dbpath, 'victors_nucl')}")
+            if megares_main_file:
+                FileHandler.fast_move(megares_main_file, os.path.join(self.dbpath, "megares_v3.fasta"))
+                print(f"Using MEGARes file: {megares_main_file}")
+            else:
+                print("Warning: No .fasta file found in MEGARes archive!")
+        except Exception as e:
+            print(f"Error downloading MEGARes ZIP: {e}")
+        finally:
+            FileHandler.clean_up_files(current_files)
 
     def _check_custom(self, diamond_exe, custom_path):
         """Check and index user Custom database"""
-        makeblastdb_exe = os.path.join(self.dppath, "makeblastdb.exe" if PanViTaConfig.is_windows() else "makeblastdb")
-        
         if not os.path.exists(custom_path):
             print(f"Error: Custom database file not found at {custom_path}")
             exit(1)
@@ -402,14 +433,16 @@ class DatabaseManager:
             shutil.copy2(custom_path, dest_path)
             
             print("Creating Custom DIAMOND index...")
-            os.system(
-                f"{diamond_exe} makedb --in {dest_path} "
-                f"-d {os.path.join(self.dbpath, 'custom')} --quiet")
+            self._make_diamond_index(diamond_exe, dest_path, "custom")
             
             print("Creating Custom BLAST index...")
-            os.system(
-                f"{makeblastdb_exe} -in {dest_path} "
-                f"-dbtype prot -out {os.path.join(self.dbpath, 'custom')}")
+            self._make_blast_index(dest_path, "custom", "prot")
                 
         except Exception as e:
-            print(f"Error processing custom database: {e}")
\ No newline at end of file
+            print(f"Error processing custom database: {e}")
+
+
+# A misspelt fallback name fails here at import, not inside a failed download
+for _database in DATABASES:
+    if "fallback" in _database:
+        _database["fallback"] = getattr(DatabaseManager, _database["fallback"])
\ No newline at end of file
@@ -69,14 +69,13 @@ class DependencyManager:
                     zip_ref.extractall('.')
                 diamond_exe = "diamond.exe"
             else:
-                diamond_file = FileHandler.safe_download(
+                FileHandler.download_tar(
                     "https://github.com/bbuchfink/diamond/releases/download/v2.1.24/diamond-linux64.tar.gz")
-                FileHandler.extract_tar_file(diamond_file)
                 diamond_exe = "diamond"
                 if not PanViTaConfig.is_windows():
                     os.chmod(diamond_exe, 0o755)
 
-            os.rename(diamond_exe, os.path.join(self.dppath, diamond_exe))
+            FileHandler.fast_move(diamond_exe, os.path.join(self.dppath, diamond_exe))
             FileHandler.clean_up_files(current_files)
             print("\nDIAMOND - Download complete!")
 
@@ -107,12 +106,10 @@ class DependencyManager:
     def _download_blast_windows(self):
         """Download and install BLAST for Windows"""
         print("Downloading BLAST for Windows (with all dependencies)...")
-        blast_file = FileHandler.safe_download(
+        # The archive is extracted while it downloads
+        FileHandler.download_tar(
             "https://ftp.ncbi.nlm.nih.gov/blast/executables/blast+/LATEST/ncbi-blast-2.17.0+-x64-win64.tar.gz")
         
-        
-        FileHandler.extract_tar_file(blast_file)
-        
         # Rest of the method remains the same...
         blast_dir = None
         for item in os.listdir('.'):
@@ -149,9 +146,9 @@ class DependencyManager:
     def _download_blast_linux(self):
         """Download and install BLAST for Linux"""
         print("Downloading BLAST for Linux...")
-        blast_file = FileHandler.safe_download(
+        # The archive is extracted while it downloads
+        FileHandler.download_tar(
             "https://ftp.ncbi.nlm.nih.gov/blast/executables/blast+/LATEST/ncbi-blast-2.17.0+-x64-linux.tar.gz")
-        FileHandler.extract_tar_file(blast_file)
         # Find the extracted BLAST directory
         blast_dir = None
         for item in os.listdir('.'):
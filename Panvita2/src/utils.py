@@ -2,32 +2,183 @@
 # Description: File handling utilities (download, extract, clean)
 
 import os
+import sys
+import errno
+import json
+import hashlib
 import shutil
 import gzip
 import tarfile
+import threading
+import queue
+import concurrent.futures
 import urllib.request
 import ssl
+import subprocess
 import wget
 from config import PanViTaConfig
 
+# Try to import requests for pooled, retrying HTTP downloads
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# curl moves the bytes in C, so it is preferred for plain file downloads
+CURL = shutil.which("curl")
+
+# Buffer used when copying downloads and archives (shutil defaults to 16-64 KiB)
+COPY_BUFSIZE = 2 * 1024 * 1024
+
+# Threads writing extracted files while the archive is still being decompressed
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _create_session():
+    """Build the shared HTTP session with keep-alive pooling and retries"""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+    # One pool per host for up to 8 hosts, each keeping up to 16 connections
+    # alive, so parallel downloads from the same server do not reconnect
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+SESSION = _create_session() if REQUESTS_AVAILABLE else None
+
+
+def _fadvise(f, advice):
+    """Hint the kernel how file f will be accessed (skipped where unsupported)"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+
+class ReadaheadReader:
+    """Sequential read-only file object filled by a background thread"""
+
+    def __init__(self, path, depth=8, block_size=COPY_BUFSIZE):
+        self._file = open(path, 'rb', buffering=0)
+        _fadvise(self._file, "POSIX_FADV_SEQUENTIAL")
+        self._blocks = queue.Queue(maxsize=depth)
+        self._block = b''
+        self._pos = 0
+        self._eof = False
+        self._error = None
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(block_size,), daemon=True)
+        self._thread.start()
+
+    def _fill(self, block_size):
+        """Background loop queueing blocks until end of file"""
+        try:
+            while not self._closed.is_set():
+                block = self._file.read(block_size)
+                self._put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self._error = e
+            self._put(b'')
+
+    def _put(self, block):
+        """Queue a block, giving up if the reader gets closed meanwhile"""
+        while not self._closed.is_set():
+            try:
+                self._blocks.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self, size=-1):
+        chunks = []
+        while size != 0 and not self._eof:
+            if self._pos >= len(self._block):
+                self._block = self._blocks.get()
+                self._pos = 0
+                if not self._block:
+                    self._eof = True
+                    if self._error is not None:
+                        raise self._error
+                    break
+            end = len(self._block) if size < 0 else min(len(self._block), self._pos + size)
+            chunks.append(self._block[self._pos:end])
+            if size > 0:
+                size -= end - self._pos
+            self._pos = end
+        return b''.join(chunks)
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        # Archives are read once, so their pages need not stay cached
+        _fadvise(self._file, "POSIX_FADV_DONTNEED")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 class FileHandler:
     @staticmethod
-    def safe_download(url, filename=None):
+    def safe_download(url, filename=None, quiet=False, meta_file=None):
         """Safe download with SSL handling and fallback options"""
         
         if filename is None:
             filename = url.split('/')[-1]
         
-        # Method 1: Try wget first (usually works with SSL context setup)
+        # Method 1: Try curl (no Python read/write loop at all)
+        if CURL:
+            try:
+                print(f"Attempting download with curl: {url}")
+                if not FileHandler.curl_download(url, filename, quiet, meta_file):
+                    print(f"Not modified since last download: {url}")
+                    return None
+                print(f"Download successful: {filename}")
+                return filename
+            except Exception as e:
+                print(f"curl failed: {e}")
+                if os.path.exists(filename):
+                    os.remove(filename)
+
+        # Method 2: Try the shared requests session (keep-alive and retries)
+        if REQUESTS_AVAILABLE:
+            try:
+                print(f"Attempting download with requests: {url}")
+                if not FileHandler.session_download(url, filename, meta_file):
+                    print(f"Not modified since last download: {url}")
+                    return None
+                print(f"Download successful: {filename}")
+                return filename
+            except Exception as e:
+                print(f"requests failed: {e}")
+                # wget would save next to a partial file instead of replacing it
+                if os.path.exists(filename):
+                    os.remove(filename)
+        
+        # Method 3: Try wget (usually works with SSL context setup)
         try:
             print(f"Attempting download with wget: {url}")
-            downloaded_file = wget.download(url, out=filename)
+            bar = None if quiet else wget.bar_adaptive
+            downloaded_file = wget.download(url, out=filename, bar=bar)
             print(f"\nDownload successful: {downloaded_file}")
             return downloaded_file
         except Exception as e:
             print(f"wget failed: {e}")
         
-        # Method 2: Try urllib with custom SSL context
+        # Method 4: Try urllib with custom SSL context
         try:
             print(f"Attempting download with urllib: {url}")
             ssl_context = ssl.create_default_context()
@@ -35,11 +186,11 @@ class FileHandler:
             ssl_context.verify_mode = ssl.CERT_NONE
             
             request = urllib.request.Request(url)
-            request.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+            request.add_header('User-Agent', USER_AGENT)
             
             with urllib.request.urlopen(request, context=ssl_context, timeout=30) as response:
                 with open(filename, 'wb') as f:
-                    shutil.copyfileobj(response, f)
+                    shutil.copyfileobj(response, f, length=COPY_BUFSIZE)
             
             print(f"\nDownload successful: {filename}")
             return filename
@@ -48,22 +199,368 @@ class FileHandler:
                 
         raise Exception(f"All download methods failed for {url}")
 
+    @staticmethod
+    def session_download(url, filename, meta_file=None):
+        """Stream url into filename, returning False on 304 Not Modified"""
+        with FileHandler.open_stream(url, meta_file) as response:
+            if response.status_code == 304:
+                return False
+            # Undo any transfer compression so the file holds the real payload
+            response.raw.decode_content = True
+            with open(filename, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=COPY_BUFSIZE)
+            FileHandler.save_validators(response, meta_file)
+        return True
+
+    @staticmethod
+    def open_stream(url, meta_file=None):
+        """Open a streamed, conditional GET of url on the shared session"""
+        headers = FileHandler.conditional_headers(meta_file)
+        response = SESSION.get(url, stream=True, timeout=60, headers=headers)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return response
+
+    @staticmethod
+    def conditional_headers(meta_file):
+        """Build If-None-Match/If-Modified-Since headers from a .meta file"""
+        headers = {}
+        if meta_file and os.path.exists(meta_file):
+            try:
+                with open(meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable {meta_file}: {e}")
+        return headers
+
+    @staticmethod
+    def save_validators(response, meta_file):
+        """Store the ETag/Last-Modified of response in meta_file for later conditional requests"""
+        FileHandler.write_meta(meta_file, response.url, response.headers.get("ETag"),
+                               response.headers.get("Last-Modified"))
+
+    @staticmethod
+    def write_meta(meta_file, url, etag, last_modified):
+        """Write the validators of a finished download to meta_file"""
+        if not meta_file:
+            return
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+
+    @staticmethod
+    def record_digest(meta_file, digest):
+        """Add the SHA-256 of a finished download to its meta_file"""
+        meta = {}
+        if os.path.exists(meta_file):
+            try:
+                with open(meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+        meta["sha256"] = digest
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+
+    @staticmethod
+    def file_sha256(path):
+        """SHA-256 hex digest of a file, read in COPY_BUFSIZE blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+            for block in iter(lambda: f.read(COPY_BUFSIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def curl_download(url, filename, quiet=False, meta_file=None):
+        """Download url into filename with curl, returning False on 304 Not Modified"""
+        header_file = filename + ".headers"
+        cmd = [CURL, "--location", "--fail", "--show-error", "--retry", "3",
+               "--compressed", "--user-agent", USER_AGENT,
+               "--dump-header", header_file, "--output", filename,
+               "--write-out", "%{http_code}"]
+        cmd.append("--silent" if quiet else "--progress-bar")
+        for name, value in FileHandler.conditional_headers(meta_file).items():
+            cmd += ["--header", f"{name}: {value}"]
+        cmd.append(url)
+
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE if quiet else None, text=True)
+            if result.returncode != 0:
+                raise Exception(f"curl exited with code {result.returncode}: {(result.stderr or '').strip()}")
+            if result.stdout.strip() == "304":
+                if os.path.exists(filename):
+                    os.remove(filename)
+                return False
+
+            FileHandler._save_dumped_validators(header_file, url, meta_file)
+        finally:
+            if os.path.exists(header_file):
+                os.remove(header_file)
+        return True
+
+    @staticmethod
+    def curl_batch(jobs, parallel_max=8):
+        """Download (url, filename, meta_file) jobs with one parallel curl run"""
+        cmd = [CURL, "--parallel", "--parallel-max", str(parallel_max)]
+        for i, (url, filename, meta_file) in enumerate(jobs):
+            if i:
+                cmd.append("--next")
+            cmd += ["--location", "--fail", "--silent", "--show-error", "--retry", "3",
+                    "--compressed", "--user-agent", USER_AGENT,
+                    "--dump-header", filename + ".headers", "--output", filename,
+                    "--write-out", "%{http_code} %{filename_effective}\n"]
+            for name, value in FileHandler.conditional_headers(meta_file).items():
+                cmd += ["--header", f"{name}: {value}"]
+            cmd.append(url)
+
+        # Transfers finish in any order, so codes are matched back by file name
+        codes = {}
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            for line in result.stdout.splitlines():
+                code, _, filename = line.partition(" ")
+                codes[filename] = code
+        except Exception as e:
+            print(f"curl failed: {e}")
+
+        results = {}
+        for url, filename, meta_file in jobs:
+            header_file = filename + ".headers"
+            code = codes.get(filename, "")
+            try:
+                if code.startswith("2"):
+                    FileHandler._save_dumped_validators(header_file, url, meta_file)
+                    results[url] = True
+                    continue
+                if os.path.exists(filename):
+                    os.remove(filename)
+                results[url] = False if code == "304" else None
+            finally:
+                if os.path.exists(header_file):
+                    os.remove(header_file)
+        return results
+
+    @staticmethod
+    def _save_dumped_validators(header_file, url, meta_file):
+        """Write meta_file from the validators in a curl header dump"""
+        # With --location the dump holds every response; the last one is the file
+        headers = {}
+        with open(header_file, 'r', encoding='latin-1') as f:
+            for line in f:
+                if line.startswith("HTTP/"):
+                    headers = {}
+                elif ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+        FileHandler.write_meta(meta_file, url, headers.get("etag"), headers.get("last-modified"))
+
+    @staticmethod
+    def download_gz(url, output_file=None, quiet=False, meta_file=None):
+        """Download a .gz file and decompress it while it arrives"""
+        if output_file is None:
+            output_file = url.split('/')[-1][:-3]  # Remove .gz extension
+
+        if REQUESTS_AVAILABLE:
+            try:
+                print(f"Attempting streamed download with requests: {url}")
+                with FileHandler.open_stream(url, meta_file) as response:
+                    if response.status_code == 304:
+                        print(f"Not modified since last download: {url}")
+                        return None
+                    # Keep the gzip stream intact, GzipFile decodes it below
+                    response.raw.decode_content = False
+                    with gzip.GzipFile(fileobj=response.raw) as f_in:
+                        with open(output_file, 'wb') as f_out:
+                            shutil.copyfileobj(f_in, f_out, length=COPY_BUFSIZE)
+                    FileHandler.save_validators(response, meta_file)
+                print(f"Download successful: {output_file}")
+                return output_file
+            except Exception as e:
+                print(f"Streamed download failed: {e}")
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+
+        gz_file = output_file + ".gz"
+        try:
+            gz_file = FileHandler.safe_download(url, gz_file, quiet=quiet)
+            FileHandler.extract_gz_file(gz_file, output_file)
+        except Exception:
+            # No half-extracted file is left for the next run to trust
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            raise
+        finally:
+            if os.path.exists(gz_file):
+                os.remove(gz_file)
+        return output_file
+
+    @staticmethod
+    def download_tar_members(url, members, extract_dir='.', quiet=False, meta_file=None):
+        """Download a tar archive and extract only the files named in members"""
+        if REQUESTS_AVAILABLE:
+            try:
+                print(f"Attempting streamed download with requests: {url}")
+                with FileHandler.open_stream(url, meta_file) as response:
+                    if response.status_code == 304:
+                        print(f"Not modified since last download: {url}")
+                        return None
+                    response.raw.decode_content = True
+                    with tarfile.open(fileobj=response.raw, mode='r|*', bufsize=COPY_BUFSIZE) as tar:
+                        FileHandler._extract_members(tar, members, extract_dir)
+                    FileHandler.save_validators(response, meta_file)
+                print(f"Download successful: {', '.join(members.values())}")
+                return extract_dir
+            except Exception as e:
+                print(f"Streamed download failed: {e}")
+
+        archive = FileHandler.safe_download(
+            url, os.path.join(extract_dir, url.split('/')[-1] + ".part"), quiet=quiet)
+        try:
+            with ReadaheadReader(archive) as reader, \
+                    tarfile.open(fileobj=reader, mode='r|*', bufsize=COPY_BUFSIZE) as tar:
+                FileHandler._extract_members(tar, members, extract_dir)
+        finally:
+            os.remove(archive)
+        return extract_dir
+
+    @staticmethod
+    def _extract_members(tar, members, extract_dir):
+        """Extract the regular files named in members under their new names"""
+        wanted = dict(members)
+        for member in tar:
+            name = os.path.basename(member.name)
+            if member.isfile() and name in wanted:
+                # Write beside the target and rename, so a failure leaves no partial file.
+                # tar.extract copies in 16 KiB pieces; COPY_BUFSIZE cuts the write calls
+                target = os.path.join(extract_dir, wanted.pop(name))
+                with tar.extractfile(member) as f_in, open(target + ".part", 'wb', buffering=0) as f_out:
+                    shutil.copyfileobj(f_in, f_out, length=COPY_BUFSIZE)
+                os.replace(target + ".part", target)
+                if not wanted:
+                    break
+        if wanted:
+            raise Exception(f"Files not found in archive: {', '.join(sorted(wanted))}")
+
+    @staticmethod
+    def fast_move(src, dst):
+        """Move a file, copying only when it crosses filesystems"""
+        try:
+            os.replace(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+            _fadvise(f_in, "POSIX_FADV_SEQUENTIAL")
+            if sys.platform.startswith('linux'):
+                size = os.fstat(f_in.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(f_out.fileno(), f_in.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            else:
+                shutil.copyfileobj(f_in, f_out, length=COPY_BUFSIZE)
+        shutil.copymode(src, dst)
+        os.remove(src)
+        return dst
+
     @staticmethod
     def extract_gz_file(gz_file, output_file=None):
         """Extract a .gz file, works on both Windows and Unix"""
         if output_file is None:
             output_file = gz_file[:-3]  # Remove .gz extension
 
-        with gzip.open(gz_file, 'rb') as f_in:
+        with open(gz_file, 'rb') as f_raw, gzip.GzipFile(fileobj=f_raw) as f_in:
+            _fadvise(f_raw, "POSIX_FADV_SEQUENTIAL")
             with open(output_file, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+                shutil.copyfileobj(f_in, f_out, length=COPY_BUFSIZE)
+            _fadvise(f_raw, "POSIX_FADV_DONTNEED")
         return output_file
 
+    @staticmethod
+    def download_tar(url, extract_dir='.', quiet=False):
+        """Download a tar archive and extract it as it arrives"""
+        if REQUESTS_AVAILABLE:
+            try:
+                print(f"Attempting streamed download with requests: {url}")
+                with FileHandler.open_stream(url) as response:
+                    response.raw.decode_content = True
+                    with tarfile.open(fileobj=response.raw, mode='r|*', bufsize=COPY_BUFSIZE) as tar:
+                        FileHandler._extract_all(tar, extract_dir)
+                print(f"Download successful: {url}")
+                return extract_dir
+            except Exception as e:
+                print(f"Streamed download failed: {e}")
+
+        archive = FileHandler.safe_download(
+            url, os.path.join(extract_dir, url.split('/')[-1] + ".part"), quiet=quiet)
+        try:
+            FileHandler.extract_tar_file(archive, extract_dir)
+        finally:
+            os.remove(archive)
+        return extract_dir
+
     @staticmethod
     def extract_tar_file(tar_file, extract_dir='.'):
         """Extract tar files using Python's tarfile module"""
-        with tarfile.open(tar_file, 'r:*') as tar:
-            tar.extractall(extract_dir)
+        with ReadaheadReader(tar_file) as reader, \
+                tarfile.open(fileobj=reader, mode='r|*', bufsize=COPY_BUFSIZE) as tar:
+            FileHandler._extract_all(tar, extract_dir)
+
+    @staticmethod
+    def _extract_all(tar, extract_dir):
+        """Extract a stream-mode tar, writing files out in worker threads"""
+        # Bounds how many decompressed files wait in memory for a writer
+        slots = threading.BoundedSemaphore(EXTRACT_WORKERS)
+        pending = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+            for member in tar:
+                parts = member.name.replace('\\', '/').split('/')
+                if os.path.isabs(member.name) or '..' in parts:
+                    raise Exception(f"Refusing to extract {member.name} outside {extract_dir}")
+                target = os.path.join(extract_dir, member.name)
+
+                if member.isdir():
+                    os.makedirs(target, exist_ok=True)
+                elif member.isfile():
+                    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+                    data = tar.extractfile(member).read()
+                    slots.acquire()
+                    future = executor.submit(FileHandler._write_member, target, data, member.mode)
+                    future.add_done_callback(lambda f: slots.release())
+                    pending.append(future)
+                else:
+                    # Links may point at files still being written
+                    concurrent.futures.wait(pending)
+                    tar.extract(member, extract_dir)
+
+            # Surface any write error
+            for future in pending:
+                future.result()
+
+    @staticmethod
+    def _write_member(target, data, mode):
+        """Write one extracted tar member and restore its permissions"""
+        with open(target, 'wb') as f:
+            f.write(data)
+        os.chmod(target, mode & 0o7777)
 
     @staticmethod
     def clean_up_files(current_files, exceptions=None):
@@ -131,7 +131,8 @@ def install_all_dependencies():
         ("UpSetPlot", "upsetplot"),
         ("plotly", "plotly"),
         ("adjustText", "adjustText"),
-        ("wget", "wget")
+        ("wget", "wget"),
+        ("requests", "requests")
     ]
     
     success_count = 0
@@ -183,7 +184,8 @@ def test_imports():
         ("from upsetplot import UpSet", "UpSetPlot"),
         ("import plotly", "plotly"),
         ("from adjustText import adjust_text", "adjustText"),
-        ("import wget", "wget")
+        ("import wget", "wget"),
+        ("import requests", "requests")
     ]
     
     failed_imports = []